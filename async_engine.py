@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+from concurrency import INPUTS, INPUTS_PER_SLICE, INPUT_INTERVAL, POLL_INTERVAL
+
+class AsyncGameSession:
+    # Coroutine counterpart of GameThreadManager's producer/consumer pair. Inputs travel
+    # through the PCB's InputChannel, so its capacity, backpressure mode and drop counters
+    # apply as they do with threads, and a slice ends by cancelling both tasks, so thousands
+    # of sessions cost a few tasks each instead of two OS threads. The channel is only used
+    # with timeout=0; "block" backpressure waits for room with asyncio sleeps instead.
+    def __init__(self, manager):
+        self.manager = manager
+        self.pcb = manager.pcb
+        self.input_ready = asyncio.Event()
+        self.dispatched_at = None
+        self.first_event_at = None
+
+    def _mark_event(self):
+        if self.first_event_at is None:
+            self.first_event_at = time.monotonic()
+
+    async def produce(self):
+        channel = self.pcb.input_queue
+        input_key = self.manager.rng.choice(INPUTS)
+        self._mark_event()
+        if channel.backpressure == "block":
+            deadline = time.monotonic() + INPUT_INTERVAL
+            while len(channel) >= channel.capacity and time.monotonic() < deadline:
+                await asyncio.sleep(POLL_INTERVAL)
+        if channel.put(input_key, timeout=0):
+            self.input_ready.set()
+            self.manager.log(f"{self.pcb.name} Producer: Added '{input_key}'")
+        else:
+            self.manager.log(f"{self.pcb.name} Producer: Dropped '{input_key}' (input queue full)")
+
+    async def producer(self):
+        for _ in range(INPUTS_PER_SLICE):
+            if self.pcb.state == "terminated":
+                break
+            await self.produce()
+            await asyncio.sleep(INPUT_INTERVAL)
+
+    async def consumer(self):
+        # Each round waits up to INPUT_INTERVAL for input, then drains everything queued
+        channel = self.pcb.input_queue
+        for _ in range(INPUTS_PER_SLICE):
+            if self.pcb.state == "terminated":
+                break
+            input_keys = channel.get_many(timeout=0)
+            if not input_keys:
+                self.input_ready.clear()
+                try:
+                    # The slack lets an input produced exactly INPUT_INTERVAL later win over the
+                    # timeout firing in the same loop iteration
+                    await asyncio.wait_for(self.input_ready.wait(), INPUT_INTERVAL + POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    continue
+                input_keys = channel.get_many(timeout=0)
+            if input_keys:
+                self._mark_event()
+                with self.pcb.score_lock:
+                    for input_key in input_keys:
+                        self.pcb.score += 1
+                        self.manager.log(f"{self.pcb.name} Consumer: Processed '{input_key}', Score: {self.pcb.score}")
+
+    async def run_slice(self, time_slice):
+        self.dispatched_at = time.monotonic()
+        self.first_event_at = None
+        tasks = [asyncio.create_task(self.producer()), asyncio.create_task(self.consumer())]
+        await asyncio.sleep(time_slice)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def dispatch_latency(self):
+        if self.first_event_at is None:
+            return None
+        return self.first_event_at - self.dispatched_at
+
+class TkAsyncioBridge:
+    # Drives an asyncio event loop from Tk's mainloop: every interval_ms the loop runs
+    # whatever callbacks and timers are ready, then hands control back to Tk. Coroutines
+    # and widgets therefore share the main thread and can touch each other directly.
+    def __init__(self, root, interval_ms=10):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.loop = asyncio.new_event_loop()
+        self._closed = False
+        self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        if self._closed:
+            return
+        if self.loop.is_running():
+            # Re-entered from a nested Tk loop (e.g. a dialog opened by a coroutine)
+            self.root.after(self.interval_ms, self._tick)
+            return
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        self.root.after(self.interval_ms, self._tick)
+
+    def create_task(self, coroutine):
+        return self.loop.create_task(coroutine)
+
+    def close(self):
+        self._closed = True
+        for task in asyncio.all_tasks(self.loop):
+            task.cancel()
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.loop.close()
@@ -0,0 +1,49 @@
+# Compares FileSystem throughput with direct I/O against the write-back buffer cache on
+# the scheduler's access pattern: create a score file, rewrite it every quantum, delete it.
+#
+#   python -m benchmarks.file_io --files 200 --writes 50
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+
+from file_system import FileSystem
+
+def run(write_back, files, writes, cache_size):
+    with tempfile.TemporaryDirectory() as root, contextlib.redirect_stdout(io.StringIO()):
+        fs = FileSystem(games_dir=root, write_back=write_back, cache_size=cache_size)
+        ops = 0
+        start = time.perf_counter()
+        for batch in range(0, files, cache_size):  # Keep at most cache_size games live at once
+            names = [f"game{i}.txt" for i in range(batch, min(files, batch + cache_size))]
+            for name in names:
+                fs.create_file(name, "Initial score: 0")
+            for score in range(1, writes + 1):
+                for name in names:
+                    fs.write_file(name, f"Score: {score}")
+            for name in names:
+                fs.read_file(name)
+                fs.delete_file(name)
+            ops += len(names) * (writes + 3)
+        fs.close()  # Includes the final flush so the comparison is fair
+        elapsed = time.perf_counter() - start
+    return ops, elapsed, fs.flushes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FileSystem direct vs write-back benchmark")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--writes", type=int, default=50, help="score updates per file")
+    parser.add_argument("--cache-size", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    print(f"{args.files} files x {args.writes} writes")
+    print(f"{'mode':<12}{'ops':>10}{'seconds':>10}{'ops/sec':>14}{'disk writes':>13}")
+    for label, write_back in (("direct", False), ("write-back", True)):
+        ops, elapsed, flushes = run(write_back, args.files, args.writes, args.cache_size)
+        disk_writes = flushes if write_back else args.files * (args.writes + 2)
+        print(f"{label:<12}{ops:>10}{elapsed:>10.3f}{ops / elapsed:>14,.0f}{disk_writes:>13}")
+
+if __name__ == "__main__":
+    main()
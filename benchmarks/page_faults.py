@@ -0,0 +1,64 @@
+# Replays synthetic address traces through a demand-paged MemoryManager and reports the
+# fault rate and translation throughput of each page-replacement policy.
+#
+#   python -m benchmarks.page_faults --frames 64 --pages 64 --processes 4 --length 100000
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from memory_management import MemoryManager
+from page_replacement import REPLACEMENT_POLICIES, OptimalReplacement
+from process_management import PCB
+
+def locality_trace(processes, pages, length, page_size, seed=0, working_set=8, drift=0.01):
+    # Each process touches a sliding window of `working_set` pages that occasionally drifts,
+    # which is the usual shape of game loops: a hot set with slow phase changes
+    rng = random.Random(seed)
+    windows = [rng.randrange(pages) for _ in range(processes)]
+    trace = []
+    for _ in range(length):
+        pid = rng.randrange(processes) + 1
+        if rng.random() < drift:
+            windows[pid - 1] = rng.randrange(pages)
+        page = (windows[pid - 1] + rng.randrange(working_set)) % pages
+        trace.append((pid, page * page_size + rng.randrange(page_size), rng.random() < 0.3))
+    return trace
+
+def replay(trace, policy, frames, pages, processes, page_size):
+    keys = [(pid, address // page_size) for pid, address, _ in trace]
+    replacement = OptimalReplacement(keys) if policy == OptimalReplacement.name else policy
+    with contextlib.redirect_stdout(io.StringIO()):
+        memory = MemoryManager(total_pages=frames, page_size=page_size, demand_paging=True, replacement=replacement)
+        for pid in range(1, processes + 1):
+            memory.allocate_memory(PCB(pid, f"Game{pid}", 0, pages))
+    start = time.perf_counter()
+    for pid, address, write in trace:
+        memory.translate_address(pid, address, write)
+    elapsed = time.perf_counter() - start
+    stats = memory.paging_stats()
+    stats["translations_per_sec"] = len(trace) / elapsed if elapsed else float("inf")
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Page-replacement fault-rate benchmark")
+    parser.add_argument("--frames", type=int, default=64)
+    parser.add_argument("--pages", type=int, default=64, help="virtual pages per process")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--length", type=int, default=100000)
+    parser.add_argument("--page-size", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    trace = locality_trace(args.processes, args.pages, args.length, args.page_size, args.seed)
+    print(f"{args.length} translations, {args.processes} processes x {args.pages} pages, {args.frames} frames")
+    print(f"{'policy':<10}{'faults':>10}{'fault rate':>12}{'evictions':>11}{'writebacks':>12}{'trans/sec':>14}")
+    for policy in REPLACEMENT_POLICIES:
+        stats = replay(trace, policy, args.frames, args.pages, args.processes, args.page_size)
+        print(f"{policy:<10}{stats['page_faults']:>10}{stats['fault_rate']:>12.4f}{stats['evictions']:>11}"
+              f"{stats['writebacks']:>12}{stats['translations_per_sec']:>14,.0f}")
+
+if __name__ == "__main__":
+    main()
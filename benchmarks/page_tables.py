@@ -0,0 +1,62 @@
+# Compares the memory footprint and translation cost of the flat, two-level and inverted
+# page-table layouts for processes with large, sparsely touched address spaces.
+#
+#   python -m benchmarks.page_tables --processes 10000 --virtual-pages 1000000
+#
+# A flat table for 10k x 1M pages would need ~80 GB, so every layout is built for a
+# sample of processes and the per-process footprint is scaled up to --processes.
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from memory_management import PAGE_TABLE_LAYOUTS, MemoryManager
+from process_management import PCB
+
+def measure(layout, sample, virtual_pages, resident, page_size, seed):
+    rng = random.Random(seed)
+    touched = {pid: rng.sample(range(virtual_pages), resident) for pid in range(1, sample + 1)}
+    with contextlib.redirect_stdout(io.StringIO()):
+        memory = MemoryManager(total_pages=sample * resident, page_size=page_size, demand_paging=True,
+                               tlb_entries=0, page_table=layout)
+        for pid in touched:
+            memory.allocate_memory(PCB(pid, f"Game{pid}", 0, virtual_pages))
+    for pid, pages in touched.items():
+        for page in pages:
+            memory.translate(pid, page * page_size)
+    lookups = [(pid, page * page_size) for pid, pages in touched.items() for page in pages] * 5
+    rng.shuffle(lookups)
+    start = time.perf_counter()
+    for pid, address in lookups:
+        memory.translate(pid, address)
+    elapsed = time.perf_counter() - start
+    return memory.page_table_bytes() / sample, elapsed / len(lookups) * 1e9
+
+def human(size):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} PB"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Page-table layout memory-footprint benchmark")
+    parser.add_argument("--processes", type=int, default=10000)
+    parser.add_argument("--virtual-pages", type=int, default=1000000)
+    parser.add_argument("--resident", type=int, default=32, help="pages each process actually touches")
+    parser.add_argument("--sample", type=int, default=8, help="processes actually built per layout")
+    parser.add_argument("--page-size", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{args.processes} processes x {args.virtual_pages} virtual pages, {args.resident} resident pages each "
+          f"(measured on {args.sample} processes)")
+    print(f"{'layout':<12}{'bytes/process':>16}{'total':>14}{'ns/translate':>15}")
+    for layout in PAGE_TABLE_LAYOUTS:
+        per_process, ns = measure(layout, args.sample, args.virtual_pages, args.resident, args.page_size, args.seed)
+        print(f"{layout:<12}{human(per_process):>16}{human(per_process * args.processes):>14}{ns:>15.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Measures how many bytes each queued process costs: the PCB on its own, the PCB once its
+# lazily created input channel and score lock exist (what every PCB paid before they were
+# made lazy), its GameThreadManager, and everything Scheduler.add_process allocates.
+#
+#   python -m benchmarks.pcb_memory --processes 100000
+#
+# Sizes come from tracemalloc, so they include every object and container entry created.
+
+import argparse
+import contextlib
+import gc
+import io
+import tempfile
+import tracemalloc
+
+from concurrency import GameThreadManager
+from file_system import FileSystem
+from instrumentation import tracer
+from memory_management import MemoryManager
+from process_management import PCB, Scheduler
+
+def traced(build):
+    # Bytes still allocated after build() returns (its result is kept alive while measuring)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return size
+
+def queued_pcbs(count):
+    return [PCB(pid, f"Game{pid % 50}", 6) for pid in range(count)]
+
+def dispatched_pcbs(count):
+    pcbs = queued_pcbs(count)
+    for pcb in pcbs:
+        pcb.input_queue, pcb.score_lock
+    return pcbs
+
+def managers(count):
+    pcbs = queued_pcbs(count)
+    return pcbs, [GameThreadManager(pcb) for pcb in pcbs]
+
+def scheduler_processes(count, cpus):
+    with tempfile.TemporaryDirectory() as root, contextlib.redirect_stdout(io.StringIO()):
+        scheduler = Scheduler(1, MemoryManager(total_pages=4 * count), FileSystem(games_dir=root, write_back=True),
+                              log_callback=lambda message: None, simulated=True, cpus=cpus)
+        return traced(lambda: [scheduler.add_process(f"Game{i % 50}", 6, 4) for i in range(count)])
+
+def human(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bytes per PCB in large process tables")
+    parser.add_argument("--processes", type=int, default=100000)
+    parser.add_argument("--cpus", type=int, default=4)
+    args = parser.parse_args(argv)
+    tracer.verbose = False
+
+    count = args.processes
+    rows = [
+        ("PCB, queued", traced(lambda: queued_pcbs(count)) - traced(lambda: [None] * count)),
+        ("PCB, after dispatch", traced(lambda: dispatched_pcbs(count)) - traced(lambda: [None] * count)),
+        ("GameThreadManager", traced(lambda: managers(count)) - traced(lambda: queued_pcbs(count)) - traced(lambda: [None] * count)),
+        ("Scheduler.add_process", scheduler_processes(count, args.cpus)),
+    ]
+    print(f"{count} processes")
+    print(f"{'':<24}{'bytes/process':>15}{'total':>12}")
+    for label, size in rows:
+        print(f"{label:<24}{size / count:>15.0f}{human(size):>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# Runs a synthetic game-launch workload headlessly through Scheduler, MemoryManager and
+# FileSystem and reports dispatch latency, throughput, allocation success and file I/O.
+#
+#   python -m benchmarks.scheduler --processes 500 --arrival poisson --rate 2 --json base.json
+#   python -m benchmarks.scheduler --processes 500 --arrival poisson --rate 2 --compare base.json
+#
+# The scheduler runs in simulated time, so latency/throughput figures are exact and
+# repeatable; wall-clock figures measure the cost of the simulation itself and are the
+# best of --repeat runs. --compare exits with status 1 if a simulated metric regressed by
+# more than --threshold percent. Wall-clock rates swing with host load, so they are only
+# reported unless --wall-threshold gives them a (looser) limit of their own.
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+
+from benchmarks.workload import ARRIVAL_PROCESSES, BURST_DISTRIBUTIONS, generate_workload, parse_mix
+from file_system import FileSystem
+from memory_management import FRAME_ALLOCATORS, MemoryManager
+from process_management import Scheduler
+from scheduling_policies import POLICIES
+
+# Metrics checked by --compare and whether bigger is better
+COMPARED = {
+    "allocation_success_rate": "higher",
+    "throughput": "higher",
+    "avg_response": "lower",
+    "p95_response": "lower",
+    "avg_turnaround": "lower",
+    "dispatches_per_sec": "higher",
+    "file_ops_per_sec": "higher",
+}
+WALL_CLOCK = {"dispatches_per_sec", "file_ops_per_sec"}  # Gated by --wall-threshold, not --threshold
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def run_once(workload, args):
+    with tempfile.TemporaryDirectory() as root, contextlib.redirect_stdout(io.StringIO()):
+        memory = MemoryManager(total_pages=args.total_pages, allocator=args.allocator)
+        fs = FileSystem(games_dir=root, write_back=args.write_back)
+        scheduler = Scheduler(args.quantum, memory, fs, log_callback=lambda message: None, simulated=True,
+                              seed=args.seed, policy=args.policy, cpus=args.cpus)
+        for arrival in workload:
+            scheduler.add_process_at(arrival.time, arrival.game, arrival.burst_time, arrival.pages_needed)
+        start = time.perf_counter()
+        scheduler.run()
+        fs.close()
+        wall = time.perf_counter() - start
+    return scheduler, fs, wall
+
+def measure(workload, args):
+    best = None
+    for _ in range(args.repeat):
+        result = run_once(workload, args)
+        if best is None or result[2] < best[2]:
+            best = result
+    scheduler, fs, wall = best
+    records = [record for runs in scheduler.completed.values() for record in runs]
+    responses = [response for _, _, response in records]
+    makespan = scheduler.clock.now()
+    dispatches = sum(cpu.dispatches for cpu in scheduler.cpus)
+    file_ops = sum(fs.op_counts.values())
+    submitted = len(workload)
+    admitted = submitted - scheduler.failed_allocations
+    return {
+        "submitted": submitted,
+        "admitted": admitted,
+        "allocation_success_rate": admitted / submitted if submitted else 0.0,
+        "completed": len(records),
+        "makespan": makespan,
+        "throughput": len(records) / makespan if makespan else 0.0,
+        "avg_response": sum(responses) / len(responses) if responses else 0.0,
+        "p95_response": percentile(responses, 0.95),
+        "max_response": max(responses, default=0.0),
+        "avg_turnaround": sum(r[1] for r in records) / len(records) if records else 0.0,
+        "avg_waiting": sum(r[0] for r in records) / len(records) if records else 0.0,
+        "dispatches": dispatches,
+        "wall_seconds": wall,
+        "dispatches_per_sec": dispatches / wall if wall else 0.0,
+        "file_ops": file_ops,
+        "file_ops_by_kind": dict(fs.op_counts),
+        "disk_flushes": fs.flushes,
+        "file_ops_per_sec": file_ops / wall if wall else 0.0,
+    }
+
+def compare(baseline, current, threshold, wall_threshold=None):
+    # Returns (metric, before, after, percent change, regressed) rows; wall-clock metrics
+    # never count as regressed when wall_threshold is None
+    rows = []
+    for metric, better in COMPARED.items():
+        before, after = baseline["metrics"].get(metric), current["metrics"].get(metric)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        worse = -change if better == "higher" else change
+        limit = wall_threshold if metric in WALL_CLOCK else threshold
+        rows.append((metric, before, after, change, limit is not None and worse > limit))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic workload benchmark for the scheduler")
+    parser.add_argument("--processes", type=int, default=500)
+    parser.add_argument("--arrival", choices=ARRIVAL_PROCESSES, default="poisson")
+    parser.add_argument("--rate", type=float, default=1.0, help="game launches per virtual second")
+    parser.add_argument("--burst", choices=BURST_DISTRIBUTIONS, default="exponential")
+    parser.add_argument("--mean-burst", type=float, default=6)
+    parser.add_argument("--mix", default="Snake=1,Tetris=1,Pong=1", help="relative launch weights per game")
+    parser.add_argument("--pages", type=int, default=4, help="pages each game needs")
+    parser.add_argument("--total-pages", type=int, default=64)
+    parser.add_argument("--allocator", choices=list(FRAME_ALLOCATORS), default="bitmap")
+    parser.add_argument("--policy", choices=list(POLICIES), default="least-runtime")
+    parser.add_argument("--cpus", type=int, default=2)
+    parser.add_argument("--quantum", type=float, default=2)
+    parser.add_argument("--write-back", action="store_true", help="use the FileSystem write-back cache")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; wall-clock figures keep the best")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --json run")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent change counted as a regression")
+    parser.add_argument("--wall-threshold", type=float,
+                        help="percent change in wall-clock rates counted as a regression (default: report only)")
+    args = parser.parse_args(argv)
+
+    workload = generate_workload(args.processes, args.arrival, args.rate, args.burst, args.mean_burst,
+                                 args.pages, parse_mix(args.mix), args.seed)
+    config = {key: value for key, value in vars(args).items() if key not in ("json", "compare", "threshold", "wall_threshold", "repeat")}
+    result = {"config": config, "metrics": measure(workload, args)}
+
+    metrics = result["metrics"]
+    print(f"{args.processes} launches ({args.arrival} arrivals at {args.rate}/s, {args.burst} bursts, mean {args.mean_burst}) "
+          f"on {args.cpus} CPU(s), policy {args.policy}")
+    print(f"  allocation success   {metrics['admitted']}/{metrics['submitted']} ({metrics['allocation_success_rate']:.1%})")
+    print(f"  throughput           {metrics['throughput']:.3f} games/s over {metrics['makespan']:.1f}s of virtual time")
+    print(f"  dispatch latency     avg {metrics['avg_response']:.2f}s, p95 {metrics['p95_response']:.2f}s, "
+          f"max {metrics['max_response']:.2f}s")
+    print(f"  turnaround           avg {metrics['avg_turnaround']:.2f}s")
+    print(f"  dispatches           {metrics['dispatches']} ({metrics['dispatches_per_sec']:,.0f}/s wall)")
+    print(f"  file I/O             {metrics['file_ops']} ops ({metrics['file_ops_per_sec']:,.0f}/s wall), "
+          f"{metrics['disk_flushes']} write-back flushes")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.json}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != config:
+            print("Warning: baseline was run with a different configuration")
+        print(f"\n{'metric':<26}{'baseline':>12}{'current':>12}{'change':>10}")
+        regressions = 0
+        for metric, before, after, change, regressed in compare(baseline, result, args.threshold, args.wall_threshold):
+            regressions += regressed
+            note = "  REGRESSION" if regressed else "  (wall clock, not gated)" if metric in WALL_CLOCK and args.wall_threshold is None else ""
+            print(f"{metric:<26}{before:>12.3f}{after:>12.3f}{change:>+9.1f}%{note}")
+        if regressions:
+            print(f"{regressions} metric(s) regressed beyond their threshold")
+            sys.exit(1)
+        print("No regressions")
+
+if __name__ == "__main__":
+    main()
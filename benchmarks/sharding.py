@@ -0,0 +1,64 @@
+# Runs one synthetic workload through ShardedScheduler with increasing shard counts and
+# reports wall-clock throughput and speedup over a single shard.
+#
+#   python -m benchmarks.sharding --processes 20000 --shards 1,2,4,8
+#
+# Every game is queued up front and the shards run in simulated time, so the run is pure
+# CPU work; throughput can only scale up to the number of host cores (os.cpu_count()).
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.workload import BURST_DISTRIBUTIONS, generate_workload, parse_mix
+from sharding import ShardedScheduler
+
+def measure(workload, shards, args):
+    with tempfile.TemporaryDirectory() as root:
+        sharded = ShardedScheduler(shards=shards, time_quantum=args.quantum, total_pages=args.pages * len(workload),
+                                   games_dir=root, policy=args.policy, cpus_per_shard=args.cpus_per_shard,
+                                   simulated=True, seed=args.seed)
+        try:
+            pids = sharded.add_processes([(arrival.game, arrival.burst_time, arrival.pages_needed) for arrival in workload])
+            start = time.perf_counter()
+            sharded.run()
+            wall = time.perf_counter() - start
+            stats = sharded.stats()
+        finally:
+            sharded.close()
+    return {
+        "admitted": sum(pid is not None for pid in pids),
+        "completed": sum(len(records) for shard in stats for records in shard["completed"].values()),
+        "dispatches": sum(cpu["dispatches"] for shard in stats for cpu in shard["cpus"]),
+        "wall_seconds": wall,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded scheduler scaling benchmark")
+    parser.add_argument("--processes", type=int, default=20000)
+    parser.add_argument("--shards", default="1,2,4", help="comma-separated shard counts to compare")
+    parser.add_argument("--cpus-per-shard", type=int, default=1)
+    parser.add_argument("--burst", choices=BURST_DISTRIBUTIONS, default="exponential")
+    parser.add_argument("--mean-burst", type=float, default=6)
+    parser.add_argument("--mix", default="Snake=1,Tetris=1,Pong=1")
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--policy", default=None)
+    parser.add_argument("--quantum", type=float, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    workload = generate_workload(args.processes, "batch", 1.0, args.burst, args.mean_burst, args.pages,
+                                 parse_mix(args.mix), args.seed)
+    print(f"{args.processes} games on {os.cpu_count()} host core(s)")
+    print(f"{'shards':>6}{'completed':>11}{'dispatches':>12}{'wall s':>9}{'dispatches/s':>14}{'speedup':>9}")
+    baseline = None
+    for shards in [int(count) for count in args.shards.split(",")]:
+        result = measure(workload, shards, args)
+        rate = result["dispatches"] / result["wall_seconds"] if result["wall_seconds"] else 0.0
+        baseline = baseline or rate
+        print(f"{shards:>6}{result['completed']:>11}{result['dispatches']:>12}{result['wall_seconds']:>9.2f}"
+              f"{rate:>14,.0f}{rate / baseline:>8.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# Measures headless cold-start time: a bare interpreter, importing each core module on its
+# own, and `cli.py` running an empty command file end to end. Exits with status 1 when the
+# CLI exceeds --budget-ms, so it can guard against a slow import creeping back in.
+#
+#   python -m benchmarks.startup --budget-ms 100
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["process_management", "memory_management", "file_system", "instrumentation", "cli"]
+
+def best_of(command, runs, cwd):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="best of this many fresh interpreters")
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        commands = os.path.join(workdir, "empty.txt")
+        open(commands, "w").close()
+        baseline = best_of([sys.executable, "-c", "pass"], args.runs, workdir)
+        print(f"{'target':<28}{'ms':>8}{'over python':>14}")
+        print(f"{'python -c pass':<28}{baseline:>8.1f}{0:>14.1f}")
+        for module in MODULES:
+            elapsed = best_of([sys.executable, "-c", f"import {module}"], args.runs, workdir)
+            print(f"{'import ' + module:<28}{elapsed:>8.1f}{elapsed - baseline:>14.1f}")
+        cli = best_of([sys.executable, os.path.join(ROOT, "cli.py"), "--file", commands, "--games-dir", "games"],
+                      args.runs, workdir)
+        print(f"{'cli.py (empty session)':<28}{cli:>8.1f}{cli - baseline:>14.1f}")
+
+    if cli > args.budget_ms:
+        print(f"Cold start {cli:.1f} ms is over the {args.budget_ms:g} ms budget")
+        sys.exit(1)
+    print(f"Cold start within the {args.budget_ms:g} ms budget")
+
+if __name__ == "__main__":
+    main()
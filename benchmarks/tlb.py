@@ -0,0 +1,57 @@
+# Micro-benchmark for address translation with and without the TLB, on both the
+# message-building translate_address path and the translate fast path.
+#
+#   python -m benchmarks.tlb --processes 4 --length 200000
+
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.page_faults import locality_trace
+from memory_management import MemoryManager
+from process_management import PCB
+
+CONFIGS = [
+    ("no TLB", {"tlb_entries": 0}),
+    ("16-entry 4-way tagged", {"tlb_entries": 16, "tlb_ways": 4}),
+    ("64-entry fully assoc.", {"tlb_entries": 64, "tlb_ways": None}),
+    ("16-entry untagged", {"tlb_entries": 16, "tlb_ways": 4, "tlb_tagged": False}),
+]
+
+def run(trace, processes, pages, page_size, fast, repeat, **tlb_options):
+    best = float("inf")
+    for _ in range(repeat):  # Best of `repeat` fresh runs to smooth out scheduler noise
+        with contextlib.redirect_stdout(io.StringIO()):
+            memory = MemoryManager(total_pages=processes * pages, page_size=page_size, **tlb_options)
+            for pid in range(1, processes + 1):
+                memory.allocate_memory(PCB(pid, f"Game{pid}", 0, pages))
+        translate = memory.translate if fast else memory.translate_address
+        start = time.perf_counter()
+        for pid, address, _ in trace:
+            translate(pid, address)
+        best = min(best, time.perf_counter() - start)
+    return len(trace) / best if best else float("inf"), memory.tlb_stats()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TLB translation micro-benchmark")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=64, help="virtual pages per process")
+    parser.add_argument("--length", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    trace = locality_trace(args.processes, args.pages, args.length, args.page_size, args.seed)
+    print(f"{args.length} translations, {args.processes} processes x {args.pages} pages")
+    print(f"{'configuration':<24}{'translate_address/s':>21}{'translate/s':>14}{'hit rate':>10}{'flushes':>9}")
+    for label, options in CONFIGS:
+        slow, _ = run(trace, args.processes, args.pages, args.page_size, False, args.repeat, **options)
+        fast, stats = run(trace, args.processes, args.pages, args.page_size, True, args.repeat, **options)
+        hit_rate = f"{stats['hit_rate']:.3f}" if stats else "-"
+        flushes = stats["flushes"] if stats else "-"
+        print(f"{label:<24}{slow:>21,.0f}{fast:>14,.0f}{hit_rate:>10}{flushes:>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# Replays an address trace through MemoryManager three ways: translate_address (one call
+# and message per access), the translate fast path, and the vectorized translate_many. It
+# checks that all three produce the same physical addresses and faults, including for a
+# sprinkling of invalid accesses (negative addresses, pages past the end, unknown pids),
+# and reports translations per second. Needs NumPy.
+#
+#   python -m benchmarks.translate_many --processes 16 --length 1000000
+#   python -m benchmarks.translate_many --demand-paging --frames 64 --replacement lru
+#   python -m benchmarks.translate_many --trace trace.txt   # lines of "pid address [w]"
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from benchmarks.page_faults import locality_trace
+from memory_management import MemoryManager
+from page_replacement import REPLACEMENT_POLICIES, OptimalReplacement
+from process_management import PCB
+
+def load_trace(path):
+    trace = []
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if fields and not fields[0].startswith("#"):
+                trace.append((int(fields[0]), int(fields[1]), len(fields) > 2 and fields[2].lower() == "w"))
+    return trace
+
+def add_invalid(trace, fraction, limit, seed):
+    # Replaces a fraction of accesses with ones every path must reject
+    rng = random.Random(seed)
+    trace = list(trace)
+    for i in rng.sample(range(len(trace)), int(len(trace) * fraction)):
+        pid, address, write = trace[i]
+        trace[i] = rng.choice([(pid, -1 - address, write), (pid, limit + address, write), (-1 - pid, address, write)])
+    return trace
+
+def build(args, processes, trace):
+    options = {}
+    if args.demand_paging:
+        # Belady's trace lists only the accesses that reach the replacement policy
+        limit, allocated = args.pages * args.page_size, set(processes)
+        keys = [(pid, address // args.page_size) for pid, address, _ in trace
+                if pid in allocated and 0 <= address < limit]
+        replacement = OptimalReplacement(keys) if args.replacement == OptimalReplacement.name else args.replacement
+        options = {"demand_paging": True, "replacement": replacement, "tlb_entries": 0}
+    frames = args.frames if args.demand_paging else len(processes) * args.pages
+    with contextlib.redirect_stdout(io.StringIO()):
+        memory = MemoryManager(total_pages=frames, page_size=args.page_size, **options)
+        for pid in processes:
+            memory.allocate_memory(PCB(pid, f"Game{pid}", 0, args.pages))
+    return memory
+
+def replay_scalar(memory, trace, fast):
+    physical, faults = [], []
+    translate = memory.translate if fast else memory.translate_address
+    start = time.perf_counter()
+    for pid, address, write in trace:
+        before = memory.page_faults
+        result = translate(pid, address, write)
+        physical.append(result if fast else result[0])
+        faults.append(memory.page_faults > before)
+    return time.perf_counter() - start, [-1 if address is None else address for address in physical], faults
+
+def replay_batch(memory, trace):
+    import numpy as np
+    pairs = np.array([(pid, address) for pid, address, _ in trace], dtype=np.int64)
+    writes = np.array([write for _, _, write in trace], dtype=bool)
+    start = time.perf_counter()
+    physical, faults = memory.translate_many(pairs, writes)
+    return time.perf_counter() - start, physical.tolist(), faults.tolist()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scalar vs vectorized address translation replay")
+    parser.add_argument("--trace", help="replay this file instead of a synthetic trace")
+    parser.add_argument("--processes", type=int, default=16)
+    parser.add_argument("--pages", type=int, default=64, help="virtual pages per process")
+    parser.add_argument("--length", type=int, default=1000000)
+    parser.add_argument("--page-size", type=int, default=1024)
+    parser.add_argument("--demand-paging", action="store_true")
+    parser.add_argument("--frames", type=int, default=256, help="physical frames when demand paging")
+    parser.add_argument("--replacement", choices=list(REPLACEMENT_POLICIES), default="lru")
+    parser.add_argument("--invalid", type=float, default=0.001,
+                        help="fraction of synthetic accesses replaced by invalid addresses")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        trace = load_trace(args.trace)
+    else:
+        trace = locality_trace(args.processes, args.pages, args.length, args.page_size, args.seed)
+    processes = sorted({pid for pid, _, _ in trace})
+    if not args.trace:
+        trace = add_invalid(trace, args.invalid, args.pages * args.page_size, args.seed)
+    mode = f"demand paging, {args.frames} frames, {args.replacement}" if args.demand_paging else "all pages resident"
+    print(f"{len(trace)} translations, {len(processes)} processes x {args.pages} pages ({mode})")
+    print(f"{'path':<20}{'seconds':>10}{'trans/sec':>15}{'speedup':>10}{'faults':>10}")
+
+    results = [
+        ("translate_address", *replay_scalar(build(args, processes, trace), trace, fast=False)),
+        ("translate", *replay_scalar(build(args, processes, trace), trace, fast=True)),
+        ("translate_many", *replay_batch(build(args, processes, trace), trace)),
+    ]
+    baseline = results[0][1]
+    for name, elapsed, _, faults in results:
+        rate = len(trace) / elapsed if elapsed else float("inf")
+        print(f"{name:<20}{elapsed:>10.3f}{rate:>15,.0f}{baseline / elapsed if elapsed else 0:>9.1f}x{sum(faults):>10}")
+    reference = results[0][2:]
+    mismatches = [name for name, _, physical, faults in results[1:] if (physical, faults) != reference]
+    print("Results differ: " + ", ".join(mismatches) if mismatches else "All paths agree")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Synthetic game-launch workloads for the scheduler benchmarks. A workload is a list of
+# Arrival records: when a game is launched, which game, its burst time and page count.
+
+import random
+
+GAMES = ["Snake", "Tetris", "Pong"]  # Same titles as GameConsoleGUI.games
+ARRIVAL_PROCESSES = ("batch", "uniform", "poisson", "bursty")
+BURST_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "bimodal")
+
+class Arrival:
+    def __init__(self, time, game, burst_time, pages_needed):
+        self.time = time
+        self.game = game
+        self.burst_time = burst_time
+        self.pages_needed = pages_needed
+
+def parse_mix(text):
+    # "Snake=5,Tetris=3,Pong=2" -> {"Snake": 5.0, ...}; games left out get no launches
+    mix = {}
+    for part in text.split(","):
+        game, _, weight = part.partition("=")
+        game = game.strip()
+        if game not in GAMES:
+            raise ValueError(f"Unknown game '{game}'. Choose from: {', '.join(GAMES)}")
+        mix[game] = float(weight or 1)
+    return mix
+
+def arrival_times(count, process, rate, rng, burst_size=8):
+    # `rate` is launches per virtual second
+    if process not in ARRIVAL_PROCESSES:
+        raise ValueError(f"Unknown arrival process '{process}'. Choose from: {', '.join(ARRIVAL_PROCESSES)}")
+    if process == "batch":
+        return [0.0] * count
+    if process == "uniform":
+        return [i / rate for i in range(count)]
+    if process == "poisson":
+        times, now = [], 0.0
+        for _ in range(count):
+            times.append(now)
+            now += rng.expovariate(rate)
+        return times
+    # Bursty: groups of burst_size launches at once, groups spaced to keep the same mean rate
+    return [(i // burst_size) * burst_size / rate for i in range(count)]
+
+def burst_time(distribution, mean, rng):
+    if distribution not in BURST_DISTRIBUTIONS:
+        raise ValueError(f"Unknown burst distribution '{distribution}'. Choose from: {', '.join(BURST_DISTRIBUTIONS)}")
+    if distribution == "fixed":
+        value = mean
+    elif distribution == "uniform":
+        value = rng.uniform(1, 2 * mean - 1)
+    elif distribution == "exponential":
+        value = rng.expovariate(1 / mean)
+    else:
+        # Mostly short sessions with the occasional long one, same overall mean
+        value = mean / 2 if rng.random() < 0.8 else mean * 3
+    return max(1, round(value))  # The GUI only accepts positive whole burst times
+
+def generate_workload(processes=200, arrival="poisson", rate=1.0, burst="exponential", mean_burst=6,
+                      pages_needed=4, mix=None, seed=0):
+    rng = random.Random(seed)
+    mix = mix or {game: 1.0 for game in GAMES}
+    games, weights = list(mix), list(mix.values())
+    return [Arrival(time, rng.choices(games, weights)[0], burst_time(burst, mean_burst, rng), pages_needed)
+            for time in arrival_times(processes, arrival, rate, rng)]
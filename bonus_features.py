@@ -33,7 +33,13 @@ def log_and_display_event(message):
     print(Fore.MAGENTA + f"[{timestamp}] {message}")
 
 def display_memory_map(memory_manager):
-    used = sum(1 for _ in range(memory_manager.total_pages) if _ not in memory_manager.free_pages)
+    used = memory_manager.used_pages
     print_boxed_message("Memory Map")
     print_progress_bar(used, memory_manager.total_pages, prefix="Used Memory:", suffix="pages")
     print(f"{Fore.GREEN}Free Pages: {memory_manager.free_pages}")
+
+def display_cpu_map(scheduler):
+    print_boxed_message("CPU Cores")
+    for core in scheduler.cpu_utilization():
+        percent = int(core["utilization"] * 100)
+        print_progress_bar(percent, 100, prefix=f"CPU {core['cpu']}:", suffix=f"busy ({core['dispatches']} dispatches, {core['steals']} steals)")
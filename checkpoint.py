@@ -0,0 +1,447 @@
+# Checkpoint/restore of the Scheduler, its MemoryManager and FileSystem in a compact
+# binary format, so long simulations can resume after a crash.
+#
+#   checkpointer = Checkpointer(scheduler, "console.ckpt")
+#   checkpointer.start(interval=5)   # background checkpoints while the scheduler runs
+#   ...
+#   restore(fresh_scheduler, "console.ckpt")
+#
+# The file is MAGIC followed by framed records (kind byte, payload length, payload): one
+# full record, then incremental records that hold only the processes changed or removed
+# since the previous checkpoint. Payloads are columnar: per-process fields are stored as
+# typed arrays and strings in a shared table, so encoding and decoding cost a few
+# array.tobytes/frombytes calls rather than per-object pickling.
+
+import gc
+import math
+import os
+import struct
+import threading
+from array import array
+
+from memory_management import FLAG_BITS
+from process_management import PCB
+
+MAGIC = b"MOSCKPT1"
+FULL, DELTA = b"F", b"D"
+RECORD_HEADER = struct.Struct("<cQ")  # Kind, payload length
+CAPTURE_CHUNK = 2048  # Processes read per lock acquisition, so dispatch keeps running during a capture
+
+class _Writer:
+    def __init__(self):
+        self.parts = []
+
+    def ints(self, *values):
+        self.parts.append(struct.pack(f"<{len(values)}q", *values))
+
+    def floats(self, *values):
+        self.parts.append(struct.pack(f"<{len(values)}d", *values))
+
+    def blob(self, data):
+        self.parts.append(struct.pack("<Q", len(data)))
+        self.parts.append(data)
+
+    def column(self, typecode, values):
+        self.blob(array(typecode, values).tobytes())
+
+    def strings(self, values):
+        self.ints(len(values))
+        self.blob("\0".join(values).encode())
+
+    def getvalue(self):
+        return b"".join(self.parts)
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def ints(self, count=1):
+        values = struct.unpack_from(f"<{count}q", self.data, self.pos)
+        self.pos += 8 * count
+        return values if count > 1 else values[0]
+
+    def floats(self, count=1):
+        values = struct.unpack_from(f"<{count}d", self.data, self.pos)
+        self.pos += 8 * count
+        return values if count > 1 else values[0]
+
+    def blob(self):
+        size = self.ints()
+        data = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return data
+
+    def column(self, typecode):
+        values = array(typecode)
+        values.frombytes(self.blob())
+        return values
+
+    def strings(self):
+        count = self.ints()
+        data = bytes(self.blob()).decode()
+        return data.split("\0") if count else []
+
+def _split(values, counts, width=1):
+    # Cuts a flat array into consecutive lists of counts[i] * width values
+    values, parts, offset = values.tolist(), [], 0
+    for count in counts:
+        parts.append(values[offset:offset + count * width])
+        offset += count * width
+    return parts
+
+class Checkpointer:
+    # Writes checkpoints of one scheduler to `path`. After full_every incremental records
+    # the file is atomically rewritten as a single full record, like HighScoreStore's
+    # journal compaction.
+    #
+    # Capture is fuzzy: processes are read CAPTURE_CHUNK at a time under the scheduler lock
+    # and encoding/writing happens outside it, so background checkpoints interleave with
+    # dispatch. Each process is captured consistently, and processes that changed during
+    # the capture are re-read at its end, so no frame is saved with two owners. One that
+    # was running is restored as ready. Policy-internal state (CFS vruntime, MLFQ levels,
+    # lottery tickets in flight) is not saved; restored processes are re-queued under the
+    # checkpointed policy.
+    #
+    # The scheduler and memory manager add the pid of every process they change to a
+    # shared `touched` set, so an incremental checkpoint reads only those processes. Only
+    # one Checkpointer may be attached to a scheduler.
+    def __init__(self, scheduler, path, full_every=10):
+        self.scheduler = scheduler
+        self.memory_manager = scheduler.memory_manager
+        self.file_system = scheduler.file_system
+        self.path = path
+        self.full_every = full_every
+        self.increments = 0
+        self.checkpoints = 0
+        self.last_bytes = 0
+        self._previous = None  # pid -> record as of the last checkpoint, for incremental diffs
+        self._history_sizes = {}  # Player -> leaderboard sessions already written
+        self._completed_sizes = {}  # Policy -> completion records already written
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _record(self, pcb, cpu_id, inverted):
+        table = self.memory_manager.page_tables.get(pcb.pid)
+        if pcb.state == "terminated" or table is None:
+            return None  # Finished or removed since the placement pass
+        if self.memory_manager.inverted_table is not None:
+            entries = tuple(inverted.get(pcb.pid, ()))
+        else:
+            entries = tuple(value for page, _ in table.resident() for value in (page, table.get(page)))
+        affinity = ",".join(str(cpu) for cpu in sorted(pcb.affinity)) if pcb.affinity is not None else ""
+        return (
+            cpu_id, pcb.burst_time, pcb.total_runtime, pcb.pages_needed, pcb.score,
+            pcb.arrival_time if pcb.arrival_time is not None else math.nan,
+            pcb.first_run_time if pcb.first_run_time is not None else math.nan,
+            pcb.name, pcb.player, affinity, len(table), tuple(pcb.pages), entries,
+        )
+
+    def _mapped(self, pids=None):
+        # Inverted layout only: one pass over the shared table, bounded by physical memory
+        inverted = {}
+        if self.memory_manager.inverted_table is not None:
+            for pid, page, entry in self.memory_manager.mapped_entries(pids):
+                inverted.setdefault(pid, []).extend((page, entry))
+        return inverted
+
+    def _locate(self, pid):
+        # (pcb, cpu_id) of a queued or running process, or None once it is gone
+        manager = self.scheduler.thread_managers.get(pid)
+        if manager is None:
+            return None
+        for cpu in self.scheduler.cpus:
+            if cpu.current is manager.pcb or cpu.run_queue.get(pid) is manager.pcb:
+                return manager.pcb, cpu.cpu_id
+        return None
+
+    def _read(self, pids, inverted, records, removed):
+        for pid in pids:
+            placed = self._locate(pid)
+            record = self._record(*placed, inverted) if placed is not None else None
+            if record is None:
+                records.pop(pid, None)
+                removed.add(pid)
+            else:
+                records[pid] = record
+                removed.discard(pid)
+
+    def _track(self):
+        # Starts a new touched set and returns the previous one (None on the first capture)
+        scheduler, memory = self.scheduler, self.memory_manager
+        touched = scheduler.touched
+        scheduler.touched = memory.touched = set()
+        return touched
+
+    def _capture(self, full):
+        scheduler, memory = self.scheduler, self.memory_manager
+        with scheduler._lock:
+            touched = self._track()
+            if full:
+                placement = []  # (pcb, cpu_id) in queue order, running processes last
+                for cpu in scheduler.cpus:
+                    placement.extend((pcb, cpu.cpu_id) for pcb in cpu.run_queue)
+                for cpu in scheduler.cpus:
+                    if cpu.current is not None:
+                        placement.append((cpu.current, cpu.cpu_id))
+                inverted = self._mapped()
+            else:
+                placement = sorted(touched)
+                inverted = self._mapped(touched)
+            completed_sizes = {} if full else self._completed_sizes
+            state = {
+                "now": scheduler.clock.now(),
+                "next_pid": scheduler.next_pid,
+                "policy": scheduler.policy.name,
+                "counters": (scheduler.dropped_inputs, scheduler.failed_allocations, memory.page_faults,
+                             memory.page_hits, memory.evictions, memory.writebacks),
+                "cpus": [(cpu.busy_time, cpu.dispatches, cpu.steals) for cpu in scheduler.cpus],
+                # Append-only histories: just what was added since the last checkpoint
+                "completed": [(name, record) for name, records in scheduler.completed.items()
+                              for record in records[completed_sizes.get(name, 0):]],
+                "completed_sizes": {name: len(records) for name, records in scheduler.completed.items()},
+            }
+        records, removed = {}, set()
+        try:
+            for start in range(0, len(placement), CAPTURE_CHUNK):
+                with scheduler._lock:
+                    if full:
+                        for pcb, cpu_id in placement[start:start + CAPTURE_CHUNK]:
+                            record = self._record(pcb, cpu_id, inverted)
+                            if record is not None:
+                                records[pcb.pid] = record
+                    else:
+                        self._read(placement[start:start + CAPTURE_CHUNK], inverted, records, removed)
+        finally:
+            with scheduler._lock:
+                # Processes changed between chunks (slices, faults, evictions, additions,
+                # removals) are re-read here, so every saved one is as of this moment and no
+                # frame has two owners. Later changes go to the next checkpoint.
+                late = self._track()
+                if late:
+                    self._read(sorted(late), self._mapped(late), records, removed)
+        state["records"], state["removed"] = records, removed
+        leaderboard = self.file_system.leaderboard
+        history_sizes = {} if full else self._history_sizes
+        with leaderboard.lock:
+            state["history"] = [(player, game, score) for player, games in leaderboard.history.items()
+                                for game, score in games[history_sizes.get(player, 0):]]
+            state["history_sizes"] = {player: len(games) for player, games in leaderboard.history.items()}
+        return state
+
+    def _encode(self, state, full):
+        records = state["records"]
+        if full:
+            changed, removed = records, []
+        else:
+            changed = {pid: record for pid, record in records.items() if self._previous.get(pid) != record}
+            removed = sorted(pid for pid in state["removed"] if pid in self._previous)
+
+        out = _Writer()
+        out.floats(state["now"])
+        out.ints(state["next_pid"], len(state["cpus"]), self.memory_manager.total_pages, self.memory_manager.page_size,
+                 *state["counters"])
+        out.strings([state["policy"]])
+        out.column("d", [value for cpu in state["cpus"] for value in cpu])
+
+        columns = list(zip(*changed.values())) if changed else [()] * 13
+        strings = {}
+        intern = lambda text: strings.setdefault(text, len(strings))
+        out.column("q", list(changed))
+        out.column("q", removed)
+        out.column("q", columns[0])  # CPU
+        out.column("d", columns[1])  # Burst time
+        out.column("d", columns[2])  # Total runtime
+        out.column("q", columns[3])  # Pages needed
+        out.column("q", columns[4])  # Score
+        out.column("d", columns[5])  # Arrival clock time (nan if unset)
+        out.column("d", columns[6])  # First run clock time (nan if unset)
+        out.column("q", [intern(name) for name in columns[7]])
+        out.column("q", [intern(player) for player in columns[8]])
+        out.column("q", [intern(affinity) for affinity in columns[9]])
+        out.column("q", columns[10])  # Virtual pages in the page table
+        out.column("q", [len(frames) for frames in columns[11]])
+        out.column("q", [frame for frames in columns[11] for frame in frames])
+        out.column("q", [len(entries) // 2 for entries in columns[12]])
+        out.column("q", [value for entries in columns[12] for value in entries])  # (page, entry) pairs
+        out.strings(list(strings))
+
+        out.strings([text for player, game, _ in state["history"] for text in (player, game)])
+        out.column("q", [score for _, _, score in state["history"]])
+        out.strings([name for name, _ in state["completed"]])
+        out.column("d", [value for _, record in state["completed"] for value in record])
+        return out.getvalue(), changed, removed
+
+    def checkpoint(self, incremental=True):
+        # Returns the size of the record written
+        self.file_system.sync()  # Game and score files are persisted by the file system itself
+        with self._write_lock:  # One capture at a time: it owns the touched sets
+            full = not incremental or self._previous is None or self.increments >= self.full_every
+            try:
+                state = self._capture(full)
+                payload, changed, removed = self._encode(state, full)
+                record = RECORD_HEADER.pack(FULL if full else DELTA, len(payload)) + payload
+                if full:
+                    temp_path = f"{self.path}.tmp"
+                    with open(temp_path, "wb") as f:
+                        f.write(MAGIC + record)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(temp_path, self.path)
+                else:
+                    with open(self.path, "ab") as f:
+                        f.write(record)
+                        f.flush()
+                        os.fsync(f.fileno())
+            except BaseException:
+                self._previous = None  # What reached the file is unknown, so the next checkpoint is full
+                raise
+            if full:
+                self._previous = changed
+                self.increments = 0
+            else:
+                self._previous.update(changed)
+                for pid in removed:
+                    del self._previous[pid]
+                self.increments += 1
+            self._history_sizes = state["history_sizes"]
+            self._completed_sizes = state["completed_sizes"]
+            self.checkpoints += 1
+            self.last_bytes = len(record)
+        return len(record)
+
+    def start(self, interval=5.0):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), daemon=True)
+        self._thread.start()
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            self.checkpoint()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+def _read_records(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a checkpoint file")
+    pos, payloads = len(MAGIC), []
+    while pos + RECORD_HEADER.size <= len(data):
+        _, size = RECORD_HEADER.unpack_from(data, pos)
+        pos += RECORD_HEADER.size
+        if pos + size > len(data):
+            break  # Torn final record from a crash mid-append; everything before it is intact
+        payloads.append(memoryview(data)[pos:pos + size])
+        pos += size
+    return payloads
+
+def _decode(payload):
+    reader = _Reader(payload)
+    state = {"now": reader.floats()}
+    next_pid, num_cpus, state["total_pages"], state["page_size"], *counters = reader.ints(10)
+    state["next_pid"], state["counters"] = next_pid, counters
+    state["policy"] = reader.strings()[0]
+    state["cpus"] = _split(reader.column("d"), [1] * num_cpus, 3)
+    pids = reader.column("q")
+    state["removed"] = reader.column("q")
+    columns = [reader.column(typecode) for typecode in "qddqqddqqqq"]
+    frame_counts = reader.column("q")
+    frames = _split(reader.column("q"), frame_counts)
+    entry_counts = reader.column("q")
+    entries = _split(reader.column("q"), entry_counts, 2)
+    strings = reader.strings()
+    state["records"] = {
+        pid: (cpu, burst, runtime, pages_needed, score, arrival, first_run,
+              strings[name], strings[player], strings[affinity], table_size, pcb_frames, pcb_entries)
+        for pid, cpu, burst, runtime, pages_needed, score, arrival, first_run, name, player, affinity, table_size,
+        pcb_frames, pcb_entries in zip(pids, *columns, frames, entries)
+    }
+    history_strings = reader.strings()
+    state["history"] = [(history_strings[2 * i], history_strings[2 * i + 1], score)
+                        for i, score in enumerate(reader.column("q"))]
+    completed_names = reader.strings()
+    state["completed"] = list(zip(completed_names, _split(reader.column("d"), [1] * len(completed_names), 3)))
+    return state
+
+def restore(scheduler, path):
+    # Loads the full record and every increment after it into a freshly constructed,
+    # empty Scheduler with the same CPU count and memory size. Returns the number of
+    # processes restored. Nothing is changed if the checkpoint is rejected.
+    enabled = gc.isenabled()
+    gc.disable()  # A restore allocates several objects per process; collecting meanwhile would rescan them all repeatedly
+    try:
+        return _restore(scheduler, path)
+    finally:
+        if enabled:
+            gc.enable()
+
+def _restore(scheduler, path):
+    memory, file_system = scheduler.memory_manager, scheduler.file_system
+    if scheduler.thread_managers:
+        raise ValueError("Restore needs a scheduler with no processes")
+    records, history, completed, state = {}, [], [], None
+    for payload in _read_records(path):
+        state = _decode(payload)
+        for pid in state["removed"]:
+            records.pop(pid, None)
+        records.update(state["records"])
+        history.extend(state["history"])
+        completed.extend(state["completed"])
+    if state is None:
+        raise ValueError(f"{path} holds no checkpoint")
+    if (state["total_pages"], state["page_size"]) != (memory.total_pages, memory.page_size):
+        raise ValueError(f"Checkpoint needs {state['total_pages']} pages of {state['page_size']} bytes")
+    if len(state["cpus"]) != len(scheduler.cpus):
+        raise ValueError(f"Checkpoint needs {len(state['cpus'])} CPUs")
+
+    # Every record is checked before anything changes: the allocator is rebuilt from the
+    # restored mappings, and a frame given to two processes fails the whole restore
+    tables, blocks = [], []
+    for pid, record in records.items():
+        table_size, frames, entries = record[10:]
+        tables.append((pid, table_size, entries))
+        if memory.demand_paging:
+            blocks.extend([entry >> FLAG_BITS] for entry in entries[1::2])
+        else:
+            blocks.append(frames)
+
+    with scheduler._lock:
+        if not memory.frames.reserve_many(blocks):
+            raise ValueError(f"{path} gives a frame to two processes")
+        if scheduler.policy.name != state["policy"]:
+            scheduler.set_policy(state["policy"])
+        if scheduler.simulated:
+            scheduler.clock.advance_to(state["now"])
+        # Clock values are stored as read; rebase them so waits carry over onto this clock
+        offset = scheduler.clock.now() - state["now"]
+        (scheduler.dropped_inputs, scheduler.failed_allocations, memory.page_faults,
+         memory.page_hits, memory.evictions, memory.writebacks) = state["counters"]
+        for cpu, (busy_time, dispatches, steals) in zip(scheduler.cpus, state["cpus"]):
+            cpu.busy_time, cpu.dispatches, cpu.steals = busy_time, int(dispatches), int(steals)
+        for name, record in completed:
+            scheduler.completed.setdefault(name, []).append(tuple(record))
+        placements = []
+        for pid, (cpu_id, burst, runtime, pages_needed, score, arrival, first_run, name, player, affinity,
+                  _, frames, _) in records.items():
+            pcb = PCB(pid, name, burst, pages_needed, player, scheduler.input_capacity, scheduler.backpressure)
+            pcb.total_runtime = runtime
+            pcb.score = score
+            pcb.arrival_time = arrival + offset
+            pcb.first_run_time = None if math.isnan(first_run) else first_run + offset
+            pcb.affinity = {int(cpu) for cpu in affinity.split(",")} if affinity else None
+            pcb.pages = frames
+            placements.append((pcb, cpu_id))
+        memory.restore_page_tables(tables)
+        if memory.tlb is not None:
+            memory.tlb.flush()
+        scheduler.restore_processes(placements)
+        scheduler.next_pid = max(scheduler.next_pid, state["next_pid"])
+    for player, game, score in history:
+        file_system.leaderboard.record(game, player, score)
+    return len(records)
@@ -0,0 +1,194 @@
+# Headless entry point: drives the Scheduler from a command file or stdin, with no GUI,
+# colours or cosmetic delays.
+#
+#   python cli.py --file session.txt        # run a script of commands, then exit
+#   python cli.py --daemon < commands.fifo  # schedule games continuously as they arrive
+#
+# Only the modules the scheduler needs are imported, so startup stays well under 100 ms
+# (see benchmarks/startup.py).
+
+import argparse
+import shlex
+import sys
+import threading
+
+from file_system import FileSystem
+from instrumentation import tracer
+from memory_management import MemoryManager
+from process_management import Scheduler
+
+HELP = """Commands:
+  add <game> [burst] [pages] [player]   queue a game (burst defaults to 6, pages to 4)
+  run                                   run the scheduler until the queue is empty
+  queue | memory | cpus | metrics       show state
+  scores [game]                         high scores, or one game's leaderboard
+  rank <game> <score>                   where a score would place among every session of a game
+  policy <name>                         switch scheduling policy
+  remove <name> | remove-pid <pid> | remove-last | clear
+  sync                                  flush buffered files to disk
+  help | quit"""
+
+class HeadlessConsole:
+    def __init__(self, scheduler, daemon=False, out=None):
+        self.scheduler = scheduler
+        self.memory_manager = scheduler.memory_manager
+        self.file_system = scheduler.file_system
+        self.out = out or sys.stdout
+        self.daemon = daemon
+        self._work = threading.Event()
+        self._stop = threading.Event()
+        self._runner = None
+        if daemon:
+            # Long-running mode: a background thread runs the scheduler whenever work is queued
+            self._runner = threading.Thread(target=self._daemon_loop, daemon=True)
+            self._runner.start()
+
+    def say(self, message):
+        print(message, file=self.out, flush=True)
+
+    def _daemon_loop(self):
+        while not self._stop.is_set():
+            self._work.wait(timeout=0.5)
+            self._work.clear()
+            if self.scheduler.ready_queue:
+                self.scheduler.run()
+
+    def execute(self, line):
+        # Runs one command line; returns False when the session should end
+        words = shlex.split(line, comments=True)
+        if not words:
+            return True
+        command, args = words[0].lower(), words[1:]
+        handler = getattr(self, "do_" + command.replace("-", "_"), None)
+        if handler is None:
+            self.say(f"Unknown command '{command}'. Type 'help' for a list.")
+            return True
+        try:
+            return handler(*args) is not False
+        except (TypeError, ValueError) as e:
+            self.say(f"Error: {e}")
+            return True
+
+    def serve(self, lines):
+        for line in lines:
+            if not self.execute(line):
+                break
+        self.close()
+
+    def close(self):
+        if self._runner is not None:
+            self._work.set()
+            while self.scheduler.has_work():
+                self._stop.wait(0.1)  # Let the daemon finish what was queued
+            self._stop.set()
+            self._work.set()
+            self._runner.join()
+        self.file_system.close()
+
+    def do_help(self):
+        self.say(HELP)
+
+    def do_quit(self):
+        return False
+
+    do_exit = do_quit
+
+    def do_add(self, game, burst=6, pages=4, player="Player"):
+        burst, pages = int(burst), int(pages)
+        if burst <= 0 or pages <= 0:
+            raise ValueError("burst and pages must be positive integers")
+        if self.scheduler.add_process(game, burst, pages, player=player) is not None:
+            self._work.set()
+
+    def do_run(self):
+        if self.daemon:
+            self.say("The daemon runs queued games automatically")
+            return
+        self.scheduler.run()
+
+    def do_queue(self):
+        self.say(self.scheduler.queue_summary())
+
+    def do_memory(self):
+        self.say(f"Memory: {self.memory_manager.used_pages}/{self.memory_manager.total_pages} pages used, "
+                 f"{self.memory_manager.free_pages} free")
+
+    def do_cpus(self):
+        for core in self.scheduler.cpu_utilization():
+            self.say(f"CPU {core['cpu']}: {core['utilization']:.0%} busy, {core['dispatches']} dispatches, "
+                     f"{core['steals']} steals, {core['queued']} queued")
+
+    def do_metrics(self):
+        for name, stats in self.scheduler.metrics().items():
+            self.say(f"[{name}] Completed: {stats['completed']}, Avg waiting: {stats['avg_waiting']:.2f}s, "
+                     f"Avg turnaround: {stats['avg_turnaround']:.2f}s, Avg response: {stats['avg_response']:.2f}s")
+        snapshot = tracer.snapshot()
+        for name, value in sorted(snapshot["counters"].items()):
+            self.say(f"{name}: {value}")
+        for name, stats in sorted(snapshot["histograms"].items()):
+            self.say(f"{name}: n={stats['count']} avg={stats['avg']:.1f}us p99={stats['p99']:.0f}us")
+
+    def do_scores(self, game=None):
+        if game is None:
+            for name, score in sorted(self.file_system.high_scores.items()):
+                self.say(f"{name}: {score}")
+            return
+        for rank, (player, score) in enumerate(self.file_system.leaderboard.top_scores(game), 1):
+            self.say(f"{rank}. {player}: {score}")
+
+    def do_rank(self, game, score):
+        leaderboard = self.file_system.leaderboard
+        self.say(f"{game}: a score of {int(score)} ranks {leaderboard.rank(game, int(score))} "
+                 f"of {leaderboard.sessions(game) + 1}")
+
+    def do_policy(self, name):
+        self.scheduler.set_policy(name)
+
+    def do_remove(self, name):
+        self.scheduler.remove_process_by_name(name)
+
+    def do_remove_pid(self, pid):
+        self.scheduler.remove_process_by_pid(int(pid))
+
+    def do_remove_last(self):
+        self.scheduler.remove_last_process()
+
+    def do_clear(self):
+        self.scheduler.clear_queue()
+
+    def do_sync(self):
+        self.file_system.sync()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Mini Game Console OS")
+    parser.add_argument("--file", help="read commands from this file instead of stdin")
+    parser.add_argument("--daemon", action="store_true", help="keep scheduling games as commands arrive")
+    parser.add_argument("--quantum", type=float, default=2)
+    parser.add_argument("--cpus", type=int, default=2)
+    parser.add_argument("--policy", default=None)
+    parser.add_argument("--total-pages", type=int, default=16)
+    parser.add_argument("--games-dir", default="games")
+    parser.add_argument("--simulated", action="store_true", help="virtual time: no sleeps, deterministic with --seed")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--quiet", action="store_true", help="hide scheduler and game logs")
+    parser.add_argument("--verbose", action="store_true", help="also print memory and file-system messages")
+    parser.add_argument("--trace", help="record spans and write a Chrome trace to this file on exit")
+    args = parser.parse_args(argv)
+
+    tracer.verbose = args.verbose
+    tracer.enable(args.trace is not None)
+    memory_manager = MemoryManager(total_pages=args.total_pages, page_size=1024)
+    file_system = FileSystem(games_dir=args.games_dir, write_back=True)
+    scheduler = Scheduler(args.quantum, memory_manager, file_system, log_callback=(lambda message: None) if args.quiet else None,
+                          simulated=args.simulated, seed=args.seed, policy=args.policy, cpus=args.cpus)
+    console = HeadlessConsole(scheduler, daemon=args.daemon)
+    if args.file:
+        with open(args.file) as f:
+            console.serve(f)
+    else:
+        console.serve(sys.stdin)
+    if args.trace:
+        tracer.export_chrome_trace(args.trace)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import time
+
+class RealClock:
+    simulated = False
+
+    def now(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+class SimulatedClock:
+    # Discrete-event clock: sleeping just advances virtual time, so nothing ever blocks
+    simulated = True
+
+    def __init__(self, start=0.0):
+        self.current = start
+
+    def now(self):
+        return self.current
+
+    def sleep(self, seconds):
+        self.current += seconds
+
+    def advance_to(self, timestamp):
+        if timestamp > self.current:
+            self.current = timestamp
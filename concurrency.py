@@ -1,13 +1,39 @@
 import threading
-import queue
 import random
 import time
 
+INPUTS = ["up", "down", "left", "right"]
+INPUTS_PER_SLICE = 2
+INPUT_INTERVAL = 0.5  # Seconds between producer inputs
+POLL_INTERVAL = 0.05  # How often an async producer re-checks a full "block" channel
+
+_default_pool = None
+
+def default_worker_pool():
+    # Shared pool for managers created without one (e.g. outside a Scheduler)
+    global _default_pool
+    if _default_pool is None:
+        from concurrent.futures import ThreadPoolExecutor  # Lazy: slow to import, unused in simulation
+        _default_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="game")
+    return _default_pool
+
 class GameThreadManager:
-    def __init__(self, pcb, log_callback=None):
+    # One per queued process, so it is slotted and its Event/task list only exist once dispatched
+    __slots__ = ("pcb", "log_callback", "rng", "pool", "stop_event", "tasks", "dispatched_at", "first_event_at")
+
+    def __init__(self, pcb, log_callback=None, rng=None, pool=None):
         self.pcb = pcb
-        self.running = False
         self.log_callback = log_callback  # Callback for GUI logging
+        self.rng = rng or random  # Seeded random.Random in simulation mode
+        self.pool = pool
+        self.stop_event = None  # Created per slice by start_threads
+        self.tasks = None
+        self.dispatched_at = None
+        self.first_event_at = None
+
+    @property
+    def running(self):
+        return self.stop_event is not None and not self.stop_event.is_set()
 
     def log(self, message):
         if self.log_callback:
@@ -15,39 +41,74 @@ class GameThreadManager:
         else:
             print(message)
 
-    def producer(self):
-        inputs = ["up", "down", "left", "right"]
-        for _ in range(2):
-            if not self.running or self.pcb.state == "terminated":
-                break
-            input_key = random.choice(inputs)
-            self.pcb.input_queue.put(input_key)
+    def _mark_event(self):
+        if self.first_event_at is None:
+            self.first_event_at = time.monotonic()
+
+    def produce(self):
+        input_key = self.rng.choice(INPUTS)
+        self._mark_event()
+        if self.pcb.input_queue.put(input_key, timeout=INPUT_INTERVAL):
             self.log(f"{self.pcb.name} Producer: Added '{input_key}'")
-            time.sleep(0.5)
+        else:
+            self.log(f"{self.pcb.name} Producer: Dropped '{input_key}' (input queue full)")
+
+    def consume_many(self, input_keys):
+        # One score_lock acquisition for the whole batch
+        self._mark_event()
+        with self.pcb.score_lock:
+            for input_key in input_keys:
+                self.pcb.score += 1
+                self.log(f"{self.pcb.name} Consumer: Processed '{input_key}', Score: {self.pcb.score}")
 
-    def consumer(self):
-        for _ in range(2):
-            if not self.running or self.pcb.state == "terminated":
+    def producer(self, stop_event):
+        for _ in range(INPUTS_PER_SLICE):
+            if stop_event.is_set() or self.pcb.state == "terminated":
                 break
-            try:
-                input_key = self.pcb.input_queue.get(timeout=0.5)
-                with self.pcb.score_lock:
-                    self.pcb.score += 1
-                    self.log(f"{self.pcb.name} Consumer: Processed '{input_key}', Score: {self.pcb.score}")
-                self.pcb.input_queue.task_done()
-            except queue.Empty:
-                pass
+            self.produce()
+            if stop_event.wait(INPUT_INTERVAL):
+                break
+
+    def consumer(self, stop_event):
+        # Each round blocks up to INPUT_INTERVAL for input, then drains everything queued.
+        # stop_threads() wakes the channel, so a stop ends the wait at once.
+        for _ in range(INPUTS_PER_SLICE):
+            if stop_event.is_set() or self.pcb.state == "terminated":
+                return
+            input_keys = self.pcb.input_queue.get_many(timeout=INPUT_INTERVAL, cancel=stop_event)
+            if input_keys:
+                self.consume_many(input_keys)
+
+    def simulate_slice(self, time_quantum):
+        # Replays one quantum of producer/consumer events in order, without threads or sleeps.
+        # The producer emits an input every INPUT_INTERVAL until the quantum expires, and the
+        # consumer picks each one up immediately, matching what the threads do in real time.
+        for step in range(INPUTS_PER_SLICE):
+            if step * INPUT_INTERVAL >= time_quantum or self.pcb.state == "terminated":
+                break
+            self.produce()
+            self.consume_many(self.pcb.input_queue.get_many(timeout=0))
 
     def start_threads(self):
-        self.running = True
-        producer_thread = threading.Thread(target=self.producer)
-        consumer_thread = threading.Thread(target=self.consumer)
-        self.pcb.threads = [producer_thread, consumer_thread]
-        for thread in self.pcb.threads:
-            thread.daemon = True
-            thread.start()
+        # Producer and consumer run as tasks on the shared worker pool; each slice gets a
+        # fresh Event so a task left over from an earlier slice can never be revived
+        self.stop_event = threading.Event()
+        self.dispatched_at = time.monotonic()
+        self.first_event_at = None
+        pool = self.pool or default_worker_pool()
+        self.tasks = [pool.submit(self.producer, self.stop_event), pool.submit(self.consumer, self.stop_event)]
 
     def stop_threads(self):
-        self.running = False
-        for thread in self.pcb.threads:
-            thread.join(timeout=0.5)
\ No newline at end of file
+        if self.stop_event is not None:
+            self.stop_event.set()
+        if self.tasks:
+            self.pcb.input_queue.wake()  # After set(), so a consumer about to wait still sees the stop
+            from concurrent.futures import wait
+            wait(self.tasks, timeout=INPUT_INTERVAL)
+            self.tasks = []
+
+    def dispatch_latency(self):
+        # Seconds from start_threads to the first producer/consumer event of the slice
+        if self.dispatched_at is None or self.first_event_at is None:
+            return None
+        return self.first_event_at - self.dispatched_at
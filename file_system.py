@@ -1,62 +1,168 @@
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from high_score_store import HighScoreStore
+from instrumentation import tracer
+from leaderboard import Leaderboard
+
+class CacheEntry:
+    def __init__(self, content, exists, dirty=False):
+        self.content = content  # None when the file exists but has not been read yet
+        self.exists = exists
+        self.dirty = dirty
 
 class FileSystem:
-    def __init__(self):
-        self.games_dir = Path("games")
+    def __init__(self, games_dir="games", write_back=False, cache_size=256, flush_interval=1.0,
+                 compact_every=1000, mmap_scores=False, leaderboard_size=10):
+        self.games_dir = Path(games_dir)
         self.games_dir.mkdir(exist_ok=True)  # Create games/ directory if it doesn't exist
         self.high_scores_file = self.games_dir / "high_scores.txt"
+        self.high_scores_journal = self.games_dir / "high_scores.journal"
+        self.score_store = HighScoreStore(self.high_scores_file, self.high_scores_journal,
+                                          compact_every=compact_every, use_mmap=mmap_scores)
         self.high_scores = self._load_high_scores()
+        self.leaderboard = Leaderboard(top_k=leaderboard_size)
+        # Write-back buffer cache: file operations update an LRU of CacheEntry objects and a
+        # background thread flushes dirty entries every flush_interval seconds. Direct I/O
+        # (write_back=False) keeps the original synchronous behaviour.
+        self.write_back = write_back
+        self.cache_size = max(1, cache_size)
+        self.cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.flushes = 0
+        self.op_counts = {"create": 0, "read": 0, "write": 0, "delete": 0, "high_score": 0}
+        self._stop_flusher = threading.Event()
+        self._flusher = None
+        if write_back and flush_interval:
+            self._flusher = threading.Thread(target=self._flush_loop, args=(flush_interval,), daemon=True)
+            self._flusher.start()
 
     def _load_high_scores(self):
-        if not self.high_scores_file.exists():
-            return {}
-        with open(self.high_scores_file, "r") as f:
-            high_scores = {}
-            for line in f:
-                if ":" in line:
-                    game, score = line.strip().split(":")
-                    high_scores[game] = int(score)
-            return high_scores
+        # Snapshot plus replayed journal; see HighScoreStore for the crash-recovery rules
+        return self.score_store.load()
 
     def _save_high_scores(self):
-        with open(self.high_scores_file, "w") as f:
-            for game, score in self.high_scores.items():
-                f.write(f"{game}:{score}\n")
+        self.score_store.compact()
+
+    def _entry(self, file_path):
+        # Caller holds cache_lock. Misses record whether the file exists; content loads lazily.
+        entry = self.cache.get(file_path)
+        if entry is None:
+            entry = self.cache[file_path] = CacheEntry(None, file_path.exists())
+            self._evict()
+        else:
+            self.cache.move_to_end(file_path)
+        return entry
+
+    def _evict(self):
+        while len(self.cache) > self.cache_size:
+            file_path, entry = self.cache.popitem(last=False)
+            if entry.dirty:
+                self._flush_entry(file_path, entry)
+
+    def _flush_entry(self, file_path, entry):
+        if entry.exists:
+            with open(file_path, "w") as f:
+                f.write(entry.content)
+        elif file_path.exists():
+            file_path.unlink()
+        entry.dirty = False
+        self.flushes += 1
+
+    def _flush_loop(self, interval):
+        while not self._stop_flusher.wait(interval):
+            self.sync()
+
+    def sync(self):
+        with self.cache_lock:
+            for file_path, entry in self.cache.items():
+                if entry.dirty:
+                    self._flush_entry(file_path, entry)
+
+    def close(self):
+        self._stop_flusher.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.sync()
+        self.score_store.close()
 
     def create_file(self, path, content):
-        file_path = self.games_dir / path
-        with open(file_path, "w") as f:
-            f.write(content)
-        print(f"Created physical file {file_path}")
+        self.op_counts["create"] += 1
+        with tracer.span("fs.create", path=path):
+            file_path = self.games_dir / path
+            if self.write_back:
+                with self.cache_lock:
+                    entry = self._entry(file_path)
+                    entry.content, entry.exists, entry.dirty = content, True, True
+            else:
+                with open(file_path, "w") as f:
+                    f.write(content)
+            tracer.emit("Created physical file %s", file_path)
 
     def read_file(self, path):
-        file_path = self.games_dir / path
-        if file_path.exists():
-            with open(file_path, "r") as f:
-                return f.read()
-        print(f"File {file_path} does not exist")
-        return None
+        self.op_counts["read"] += 1
+        with tracer.span("fs.read", path=path):
+            file_path = self.games_dir / path
+            if self.write_back:
+                with self.cache_lock:
+                    entry = self._entry(file_path)
+                    if entry.exists:
+                        if entry.content is None:
+                            with open(file_path, "r") as f:
+                                entry.content = f.read()
+                        return entry.content
+            elif file_path.exists():
+                with open(file_path, "r") as f:
+                    return f.read()
+            tracer.emit("File %s does not exist", file_path)
+            return None
 
     def write_file(self, path, content):
-        file_path = self.games_dir / path
-        if file_path.exists():
-            with open(file_path, "w") as f:
-                f.write(content)
-            print(f"Wrote to file {file_path}: {content}")
-        else:
-            print(f"File {file_path} does not exist")
+        self.op_counts["write"] += 1
+        with tracer.span("fs.write", path=path):
+            file_path = self.games_dir / path
+            if self.write_back:
+                with self.cache_lock:
+                    entry = self._entry(file_path)
+                    exists = entry.exists
+                    if exists:
+                        entry.content, entry.dirty = content, True
+            else:
+                exists = file_path.exists()
+                if exists:
+                    with open(file_path, "w") as f:
+                        f.write(content)
+            if exists:
+                tracer.emit("Wrote to file %s: %s", file_path, content)
+            else:
+                tracer.emit("File %s does not exist", file_path)
 
     def delete_file(self, path):
-        file_path = self.games_dir / path
-        if file_path.exists():
-            file_path.unlink()
-            print(f"Deleted file {file_path}")
-        else:
-            print(f"File {file_path} does not exist")
+        self.op_counts["delete"] += 1
+        with tracer.span("fs.delete", path=path):
+            file_path = self.games_dir / path
+            if self.write_back:
+                with self.cache_lock:
+                    entry = self._entry(file_path)
+                    exists = entry.exists
+                    if exists:
+                        entry.content, entry.exists, entry.dirty = None, False, True
+            else:
+                exists = file_path.exists()
+                if exists:
+                    file_path.unlink()
+            if exists:
+                tracer.emit("Deleted file %s", file_path)
+            else:
+                tracer.emit("File %s does not exist", file_path)
 
-    def save_high_score(self, game_name, score):
-        if game_name not in self.high_scores or score > self.high_scores[game_name]:
-            self.high_scores[game_name] = score
-            self._save_high_scores()
-            print(f"Updated high score for {game_name}: {score}")
\ No newline at end of file
+    def save_high_score(self, game_name, score, player="Player"):
+        self.op_counts["high_score"] += 1
+        with tracer.span("fs.high_score", game=game_name):
+            self.leaderboard.record(game_name, player, score)
+            if game_name not in self.high_scores or score > self.high_scores[game_name]:
+                self.high_scores[game_name] = score
+                self.score_store.record(game_name, score)
+                tracer.emit("Updated high score for %s: %s", game_name, score)
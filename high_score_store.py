@@ -0,0 +1,187 @@
+import mmap
+import os
+from collections.abc import MutableMapping
+
+SORTED_HEADER = b"# sorted\n"  # Marks snapshots written by compact(); legacy parsers skip it (no ':')
+
+class MmapScoreTable(MutableMapping):
+    # Dict-like high-score table over an mmap'd snapshot sorted by game name. Lookups
+    # binary-search the mapped bytes, so opening a huge leaderboard costs O(1) instead of
+    # parsing every line; updates live in an in-memory overlay until the next compaction.
+    def __init__(self, path):
+        self._file = None
+        self._mm = None
+        self._overlay = {}
+        self._deleted = set()
+        self._snapshot_len = 0
+        self._added = 0
+        self.remap(path)
+
+    def remap(self, path):
+        self.close()
+        self._overlay.clear()
+        self._deleted.clear()
+        self._added = 0
+        self._snapshot_len = 0
+        if os.path.getsize(path) > len(SORTED_HEADER):
+            self._file = open(path, "rb")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            body = self._mm[len(SORTED_HEADER):]
+            self._snapshot_len = body.count(b"\n") + (0 if body.endswith(b"\n") else 1)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._file.close()
+            self._mm = self._file = None
+
+    def _lookup(self, game):
+        if self._mm is None:
+            return None
+        key = game.encode()
+        start, size = len(SORTED_HEADER), len(self._mm)
+        lo, hi = start, size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            line_start = self._mm.rfind(b"\n", start - 1, mid) + 1
+            line_end = self._mm.find(b"\n", line_start)
+            if line_end == -1:
+                line_end = size
+            name, _, score = self._mm[line_start:line_end].partition(b":")
+            if name == key:
+                return int(score)
+            if name < key:
+                lo = line_end + 1
+            else:
+                hi = line_start
+        return None
+
+    def _snapshot_items(self):
+        if self._mm is None:
+            return
+        for line in self._mm[len(SORTED_HEADER):].splitlines():
+            name, _, score = line.partition(b":")
+            yield name.decode(), int(score)
+
+    def __getitem__(self, game):
+        if game in self._overlay:
+            return self._overlay[game]
+        score = None if game in self._deleted else self._lookup(game)
+        if score is None:
+            raise KeyError(game)
+        return score
+
+    def __setitem__(self, game, score):
+        if game not in self._overlay and (game in self._deleted or self._lookup(game) is None):
+            self._added += 1
+        self._deleted.discard(game)
+        self._overlay[game] = score
+
+    def __delitem__(self, game):
+        self[game]  # Raises KeyError if missing
+        self._overlay.pop(game, None)
+        self._deleted.add(game)
+        self._added -= 1
+
+    def __iter__(self):
+        for game, _ in self._snapshot_items():
+            if game not in self._overlay and game not in self._deleted:
+                yield game
+        yield from self._overlay
+
+    def __len__(self):
+        return self._snapshot_len + self._added
+
+class HighScoreStore:
+    # Log-structured persistence for FileSystem.high_scores. Every improvement is one
+    # appended "game:score" line in the journal; load() replays the journal over the last
+    # snapshot, ignoring (and truncating) a torn final line left by a crash. Once the
+    # journal holds compact_every records, compact() atomically rewrites the snapshot and
+    # empties the journal. Scores only ever increase, so replay keeps the max and is safe
+    # to repeat if a crash lands between the snapshot rename and the journal truncation.
+    def __init__(self, snapshot_path, journal_path, compact_every=1000, use_mmap=False, fsync=False):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compact_every = compact_every
+        self.use_mmap = use_mmap
+        self.fsync = fsync
+        self.journal_entries = 0
+        self.scores = None
+        self._journal = None
+
+    def load(self):
+        if self.use_mmap and self._is_sorted_snapshot():
+            scores = MmapScoreTable(self.snapshot_path)
+        else:
+            scores = self._parse_snapshot()
+        self.scores = scores
+        self._replay_journal(scores)
+        self._journal = open(self.journal_path, "a")
+        if self.use_mmap and not isinstance(scores, MmapScoreTable) and scores:
+            self.compact()  # Migrate a legacy snapshot so the next startup can be mapped
+        return self.scores
+
+    def _is_sorted_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return False
+        with open(self.snapshot_path, "rb") as f:
+            return f.read(len(SORTED_HEADER)) == SORTED_HEADER
+
+    def _parse_snapshot(self):
+        scores = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r") as f:
+                for line in f:
+                    if ":" in line:
+                        game, score = line.strip().rsplit(":", 1)
+                        scores[game] = int(score)
+        return scores
+
+    def _replay_journal(self, scores):
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb") as f:
+            data = f.read()
+        good = data.rfind(b"\n") + 1  # Anything after the last newline is a torn write
+        for line in data[:good].splitlines():
+            game, sep, score = line.decode().rpartition(":")
+            if sep and score.isdigit():
+                if game not in scores or int(score) > scores[game]:
+                    scores[game] = int(score)
+                self.journal_entries += 1
+        if good < len(data):
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good)
+
+    def record(self, game, score):
+        self._journal.write(f"{game}:{score}\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+        self.journal_entries += 1
+        if self.journal_entries >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(SORTED_HEADER)
+            for game in sorted(self.scores, key=lambda name: name.encode()):
+                f.write(f"{game}:{self.scores[game]}\n".encode())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        if isinstance(self.scores, MmapScoreTable):
+            self.scores.remap(self.snapshot_path)
+        if self._journal is not None:
+            self._journal.truncate(0)
+        self.journal_entries = 0
+
+    def close(self):
+        if self._journal is not None:
+            if self.journal_entries:
+                self.compact()
+            self._journal.close()
+            self._journal = None
+        if isinstance(self.scores, MmapScoreTable):
+            self.scores.close()
@@ -0,0 +1,102 @@
+import queue
+import threading
+
+BACKPRESSURE_MODES = ("block", "drop-oldest", "drop-newest")
+
+class InputChannel:
+    # Bounded ring buffer for a game's key presses. When it is full, "block" makes put()
+    # wait for room (up to its timeout), "drop-oldest" overwrites the oldest input and
+    # "drop-newest" rejects the new one; drops are counted either way. put_many/get_many
+    # move a whole batch per lock acquisition.
+    def __init__(self, capacity=64, backpressure="drop-oldest"):
+        if backpressure not in BACKPRESSURE_MODES:
+            raise ValueError(f"Unknown backpressure mode '{backpressure}'. Choose from: {', '.join(BACKPRESSURE_MODES)}")
+        self.capacity = max(1, capacity)
+        self.backpressure = backpressure
+        self.buffer = [None] * self.capacity
+        self.head = 0  # Index of the oldest input
+        self.count = 0
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+        self.puts = 0
+        self.gets = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def __len__(self):
+        return self.count
+
+    def _push(self, item):
+        # Caller holds the lock and has made room unless dropping the oldest
+        if self.count == self.capacity:
+            self.buffer[self.head] = item
+            self.head = (self.head + 1) % self.capacity
+            self.dropped += 1
+        else:
+            self.buffer[(self.head + self.count) % self.capacity] = item
+            self.count += 1
+            self.max_depth = max(self.max_depth, self.count)
+        self.puts += 1
+
+    def put(self, item, timeout=None):
+        return self.put_many([item], timeout) == 1
+
+    def put_many(self, items, timeout=None):
+        # Returns how many items were queued; the rest were dropped
+        accepted = 0
+        with self.not_full:
+            for i, item in enumerate(items):
+                if self.count == self.capacity:
+                    if self.backpressure == "drop-newest":
+                        self.dropped += len(items) - i
+                        break
+                    if self.backpressure == "block":
+                        self.not_empty.notify_all()  # Let consumers make room for the rest
+                        if not self.not_full.wait_for(lambda: self.count < self.capacity, timeout):
+                            self.dropped += len(items) - i
+                            break
+                self._push(item)
+                accepted += 1
+            if accepted:
+                self.not_empty.notify_all()
+        return accepted
+
+    def get(self, timeout=None):
+        items = self.get_many(1, timeout)
+        if not items:
+            raise queue.Empty
+        return items[0]
+
+    def get_many(self, max_items=None, timeout=None, cancel=None):
+        # Waits up to timeout for at least one input (0 never waits), then takes everything
+        # queued up to max_items. Returns an empty list on timeout, or once the `cancel`
+        # Event is set and wake() is called.
+        with self.not_empty:
+            if not self.count and timeout != 0:
+                self.not_empty.wait_for(lambda: self.count or (cancel is not None and cancel.is_set()), timeout)
+            n = self.count if max_items is None else min(max_items, self.count)
+            items = [self.buffer[(self.head + i) % self.capacity] for i in range(n)]
+            for i in range(n):
+                self.buffer[(self.head + i) % self.capacity] = None
+            self.head = (self.head + n) % self.capacity
+            self.count -= n
+            self.gets += n
+            if n:
+                self.not_full.notify_all()
+            return items
+
+    def wake(self):
+        # Makes blocked get_many() calls re-check their cancel Event
+        with self.not_empty:
+            self.not_empty.notify_all()
+
+    def stats(self):
+        return {
+            "depth": self.count,
+            "max_depth": self.max_depth,
+            "capacity": self.capacity,
+            "puts": self.puts,
+            "gets": self.gets,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from collections import deque
+
+class Histogram:
+    # Power-of-two buckets (bucket b holds values below 2**b), plus exact count/sum/min/max
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        bucket = int(value).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, fraction):
+        # Upper bound of the bucket holding the requested rank, capped at the observed max
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= fraction * self.count:
+                return min(2 ** bucket, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "min": self.min,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+class _Span:
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.span_end(self.name, self.start, **self.args)
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class Tracer:
+    # Counters, histograms and span timings for the hot paths, exportable as a Chrome
+    # trace (chrome://tracing or ui.perfetto.dev). Everything is off by default: hot paths
+    # test `tracer.enabled` before touching the clock, so a disabled tracer costs one
+    # attribute check. `verbose` separately controls the console messages MemoryManager
+    # and FileSystem emit; they are %-formatted only when actually printed.
+    def __init__(self, enabled=False, verbose=True, max_events=100000):
+        self.enabled = enabled
+        self.verbose = verbose
+        self.counters = {}
+        self.histograms = {}
+        self.events = deque(maxlen=max_events)  # (name, start, duration, thread id, args)
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.events.clear()
+            self.origin = time.perf_counter()
+
+    def emit(self, message, *args):
+        if self.verbose:
+            print(message % args if args else message)
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            with self.lock:
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, value):
+        if self.enabled:
+            with self.lock:
+                histogram = self.histograms.get(name)
+                if histogram is None:
+                    histogram = self.histograms[name] = Histogram()
+                histogram.add(value)
+
+    def span(self, name, **args):
+        # Context manager timing a block; the shared no-op span when disabled
+        return _Span(self, name, args) if self.enabled else _NULL_SPAN
+
+    def span_end(self, name, start, **args):
+        # For hot paths: `start = time.perf_counter() if tracer.enabled else None` up front,
+        # then `if start is not None: tracer.span_end(...)`, which skips the context manager
+        end = time.perf_counter()
+        duration_us = (end - start) * 1e6
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(duration_us)
+            self.events.append((name, start, end - start, threading.get_ident(), args))
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {name: histogram.summary() for name, histogram in self.histograms.items()},
+            }
+
+    def export_chrome_trace(self, path):
+        # Complete ("X") events per span plus a final counter sample, in Trace Event Format
+        import json  # Only needed here; keeps json off the headless startup path
+        pid = os.getpid()
+        with self.lock:
+            events = [{
+                "name": name,
+                "cat": name.split(".")[0],
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            } for name, start, duration, tid, args in self.events]
+            now = (time.perf_counter() - self.origin) * 1e6
+            events.extend({"name": name, "ph": "C", "ts": now, "pid": pid, "tid": 0, "args": {"value": value}}
+                          for name, value in self.counters.items())
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+tracer = Tracer()  # Shared by Scheduler, MemoryManager and FileSystem
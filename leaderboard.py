@@ -0,0 +1,114 @@
+import bisect
+import itertools
+import threading
+from array import array
+
+class ScoreCounts:
+    # Every recorded score of one game as a bucketed sorted list: sorted buckets of at most
+    # 2 * LOAD scores, each bucket's maximum (bisected to find a score's bucket) and a
+    # Fenwick tree over bucket sizes for prefix counts. Adding a score and counting the
+    # scores at most some value are O(log n); a bucket insert shifts at most 2 * LOAD values,
+    # and the small tree is rebuilt only when a bucket splits.
+    LOAD = 256
+
+    def __init__(self):
+        self.buckets = []  # array("q") per bucket
+        self.maxes = []
+        self.tree = [0]  # 1-based Fenwick tree over len(bucket)
+        self.total = 0
+
+    def _rebuild(self):
+        tree = [0] * (len(self.buckets) + 1)
+        for i, bucket in enumerate(self.buckets, 1):
+            tree[i] += len(bucket)
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def add(self, score):
+        self.total += 1
+        if not self.buckets:
+            self.buckets.append(array("q", [score]))
+            self.maxes.append(score)
+            self._rebuild()
+            return
+        index = min(bisect.bisect_left(self.maxes, score), len(self.buckets) - 1)
+        bucket = self.buckets[index]
+        bisect.insort(bucket, score)
+        self.maxes[index] = bucket[-1]
+        if len(bucket) > 2 * self.LOAD:
+            self.buckets[index:index + 1] = [bucket[:self.LOAD], bucket[self.LOAD:]]
+            self.maxes[index:index + 1] = [bucket[self.LOAD - 1], bucket[-1]]
+            self._rebuild()
+            return
+        i = index + 1
+        while i < len(self.tree):
+            self.tree[i] += 1
+            i += i & -i
+
+    def at_most(self, score):
+        # Buckets whose maximum is <= score count whole; the next one is bisected
+        index = bisect.bisect_right(self.maxes, score)
+        count, i = 0, index
+        while i > 0:
+            count += self.tree[i]
+            i -= i & -i
+        if index < len(self.buckets):
+            count += bisect.bisect_right(self.buckets[index], score)
+        return count
+
+class Leaderboard:
+    # Per-game top-K lists kept sorted with bisect, per-player session history and rank
+    # queries. `changed` collects games whose top list moved so views can redraw just those.
+    # It lives in memory only: each launch starts empty, since the high-score journal keeps
+    # just each game's best score, and checkpoint.py is what carries it across a restart.
+    def __init__(self, top_k=10):
+        self.top_k = top_k
+        self.top = {}  # Game -> ascending list of (-score, seq, player)
+        self.counts = {}  # Game -> ScoreCounts over every recorded session
+        self.history = {}  # Player -> list of (game, score) in the order they were played
+        self.changed = set()
+        self.lock = threading.Lock()
+        self._seq = itertools.count()  # Earlier sessions win ties
+
+    def record(self, game, player, score):
+        with self.lock:
+            self.history.setdefault(player, []).append((game, score))
+            self.counts.setdefault(game, ScoreCounts()).add(score)
+            top = self.top.setdefault(game, [])
+            entry = (-score, next(self._seq), player)
+            if len(top) < self.top_k or entry < top[-1]:
+                bisect.insort(top, entry)
+                if len(top) > self.top_k:
+                    top.pop()
+                self.changed.add(game)
+
+    def top_scores(self, game, k=None):
+        with self.lock:
+            top = self.top.get(game, [])
+            return [(player, -neg_score) for neg_score, _, player in top[:k or self.top_k]]
+
+    def rank(self, game, score):
+        # 1-based rank a session with `score` would have among every recorded session
+        with self.lock:
+            counts = self.counts.get(game)
+            if counts is None:
+                return 1
+            return counts.total - counts.at_most(score) + 1
+
+    def sessions(self, game):
+        counts = self.counts.get(game)
+        return counts.total if counts else 0
+
+    def player_history(self, player):
+        with self.lock:
+            return list(self.history.get(player, []))
+
+    def player_best(self, player, game):
+        return max((score for played, score in self.player_history(player) if played == game), default=None)
+
+    def pop_changed(self):
+        with self.lock:
+            changed, self.changed = self.changed, set()
+            return changed
@@ -0,0 +1,96 @@
+import atexit
+import queue
+import threading
+from collections import deque
+
+class LogSink:
+    # Lock-free hand-off from scheduler and game threads to the GUI: producers append to a
+    # deque (atomic under the GIL) and the Tk thread drains it in batches once per frame.
+    # When more than max_pending lines are waiting, only every sample_rate-th line is kept
+    # (up to twice max_pending) and the rest are counted as dropped. drain() must only be
+    # called from one thread.
+    def __init__(self, max_pending=5000, sample_rate=10):
+        self.pending = deque()
+        self.max_pending = max_pending
+        self.sample_rate = sample_rate
+        self.drained = 0
+        self.sampled = 0
+        self.dropped = 0
+        self._overload_lock = threading.Lock()
+        self._overflow_seen = 0
+
+    def write(self, message):
+        if len(self.pending) < self.max_pending:
+            self.pending.append(message)
+            return
+        with self._overload_lock:
+            self._overflow_seen += 1
+            if self._overflow_seen % self.sample_rate == 0 and len(self.pending) < 2 * self.max_pending:
+                self.pending.append(message)
+                self.sampled += 1
+            else:
+                self.dropped += 1
+
+    def drain(self, limit):
+        batch = []
+        while self.pending and len(batch) < limit:
+            batch.append(self.pending.popleft())
+        self.drained += len(batch)
+        return batch
+
+    @property
+    def accepted(self):
+        # Lines that took the unsampled path. Derived rather than counted in write(), where
+        # an unlocked += from many threads would lose increments.
+        return self.drained + len(self.pending) - self.sampled
+
+    def stats(self):
+        return {
+            "accepted": self.accepted,
+            "sampled": self.sampled,
+            "dropped": self.dropped,
+            "pending": len(self.pending),
+        }
+
+class AsyncFileSink:
+    # Appends lines to a file from a background thread, writing whatever has queued up in
+    # one batch and keeping the file open, instead of an open()/close() per line
+    def __init__(self, path, flush_interval=0.5):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.queue = queue.SimpleQueue()
+        self.written = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, line):
+        self.queue.put(line)
+
+    def _run(self):
+        with open(self.path, "a") as log_file:
+            while True:
+                try:
+                    batch = [self.queue.get(timeout=self.flush_interval)]
+                except queue.Empty:
+                    continue
+                while True:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = None in batch
+                lines = [line for line in batch if line is not None]
+                if lines:
+                    log_file.write("\n".join(lines) + "\n")
+                    log_file.flush()
+                    self.written += len(lines)
+                if stop:
+                    return
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self.queue.put(None)
+            self._thread.join()
@@ -2,34 +2,55 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from process_management import Scheduler, PCB
 from memory_management import MemoryManager
+from scheduling_policies import POLICIES
 from file_system import FileSystem
 from bonus_features import (
     show_ascii_title,
     show_loading_animation,
     display_memory_map,
+    display_cpu_map,
     play_startup_sound,
     log_and_display_event
 )
-from utils import print_boxed_message
+from utils import print_boxed_message, use_async_event_log
+from log_pipeline import LogSink
+from async_engine import TkAsyncioBridge
+from instrumentation import tracer
+import sys
 import threading
 import time
 from colorama import init
 
+LOG_FRAME_MS = 50  # How often the GUI drains the log sink
+LOG_BATCH = 200  # Most lines inserted per frame
+LOG_RETAINED_LINES = 1000  # Older lines are trimmed from the log widget
+METRICS_FRAME_MS = 1000  # How often the metrics panel refreshes while tracing
+TRACE_FILE = "trace.json"  # Open in ui.perfetto.dev or chrome://tracing
+
 class GameConsoleGUI:
-    def __init__(self, root):
+    def __init__(self, root, engine="threads"):
         self.root = root
         self.root.title("Mini Game Console OS")
-        self.root.geometry("600x650")
+        self.root.geometry("600x820")
         self.root.minsize(400, 500)  # Minimum window size
         self.root.configure(bg="#000000")
         self.games = ["Snake", "Tetris", "Pong"]
+        self.score_lines = {}  # Game -> line number in the high scores panel
+        self.log_sink = LogSink()
+        self.reported_drops = 0
+        use_async_event_log()
+        tracer.verbose = False  # Memory and file messages would only clutter the terminal behind the GUI
         init(autoreset=True)
         show_ascii_title()
         play_startup_sound()
         self.memory_manager = MemoryManager(total_pages=16, page_size=1024)
-        self.file_system = FileSystem()
-        self.scheduler = Scheduler(time_quantum=2, memory_manager=self.memory_manager, file_system=self.file_system, log_callback=self.log_to_gui)
+        self.file_system = FileSystem(write_back=True)
+        self.scheduler = Scheduler(time_quantum=2, memory_manager=self.memory_manager, file_system=self.file_system, log_callback=self.log_to_gui, cpus=2)
+        # "async" runs the scheduler as coroutines on an asyncio loop pumped by Tk's mainloop
+        self.async_bridge = TkAsyncioBridge(self.root) if engine == "async" else None
         self.setup_gui()
+        self.root.after(LOG_FRAME_MS, self._drain_log)
+        self.root.after(METRICS_FRAME_MS, self._refresh_metrics)
 
     def setup_gui(self):
         style = ttk.Style()
@@ -58,12 +79,25 @@ class GameConsoleGUI:
         self.memory_text.pack(pady=5, fill="x")
         self.memory_text.config(state="disabled")
 
+        # CPU Cores Display
+        ttk.Label(self.main_frame, text="CPU Cores:").pack(anchor="w")
+        self.cpu_text = tk.Text(self.main_frame, height=2, width=50, font=("Courier", 10), bg="#000000", fg="#00FF00", insertbackground="#00FF00")
+        self.cpu_text.pack(pady=5, fill="x")
+        self.cpu_text.config(state="disabled")
+
         # High Scores Display
         ttk.Label(self.main_frame, text="High Scores:").pack(anchor="w")
         self.scores_text = tk.Text(self.main_frame, height=4, width=50, font=("Courier", 10), bg="#000000", fg="#00FF00", insertbackground="#00FF00")
         self.scores_text.pack(pady=5, fill="x")
         self.scores_text.config(state="disabled")
 
+        # Live Metrics Display (filled while tracing is on)
+        ttk.Label(self.main_frame, text="Metrics:").pack(anchor="w")
+        self.metrics_text = tk.Text(self.main_frame, height=4, width=50, font=("Courier", 10), bg="#000000", fg="#00FF00", insertbackground="#00FF00")
+        self.metrics_text.pack(pady=5, fill="x")
+        self.metrics_text.insert(tk.END, "Tracing is off")
+        self.metrics_text.config(state="disabled")
+
         # Scheduler Log Display
         ttk.Label(self.main_frame, text="Scheduler Log:").pack(anchor="w")
         log_frame = ttk.Frame(self.main_frame)
@@ -95,6 +129,19 @@ class GameConsoleGUI:
         self.remove_combo.pack(side="left", padx=5, fill="x", expand=True)
         ttk.Button(remove_frame, text="Remove Sel.", command=self.remove_selected_process).pack(side="left", padx=5)  # Shortened button text
 
+        # Scheduling Policy Frame
+        policy_frame = ttk.Frame(self.main_frame)
+        policy_frame.pack(pady=5, fill="x")
+        ttk.Label(policy_frame, text="Policy:").pack(side="left")
+        self.policy_combo = ttk.Combobox(policy_frame, values=list(POLICIES), state="readonly", width=15)
+        self.policy_combo.set(self.scheduler.policy.name)
+        self.policy_combo.pack(side="left", padx=5, fill="x", expand=True)
+        self.policy_combo.bind("<<ComboboxSelected>>", self.change_policy)
+        ttk.Label(policy_frame, text="Player:").pack(side="left")
+        self.player_entry = ttk.Entry(policy_frame, width=10)
+        self.player_entry.insert(0, "Player")
+        self.player_entry.pack(side="left", padx=5, fill="x", expand=True)
+
         # Buttons Frame with Grid Layout
         button_frame = ttk.Frame(self.main_frame)
         button_frame.pack(pady=10, fill="x")
@@ -107,13 +154,29 @@ class GameConsoleGUI:
         ttk.Button(button_frame, text="Clear Queue", command=self.clear_queue).grid(row=1, column=1, padx=5, pady=5, sticky="ew")
         ttk.Button(button_frame, text="Remove Last", command=self.remove_last_process).grid(row=1, column=2, padx=5, pady=5, sticky="ew")
         ttk.Button(button_frame, text="Exit", command=self.exit).grid(row=1, column=3, padx=5, pady=5, sticky="ew")
+        self.trace_button = ttk.Button(button_frame, text="Trace: Off", command=self.toggle_tracing)
+        self.trace_button.grid(row=2, column=0, columnspan=2, padx=5, sticky="ew")
+        ttk.Button(button_frame, text="Export Trace", command=self.export_trace).grid(row=2, column=2, columnspan=2, padx=5, sticky="ew")
 
     def log_to_gui(self, message):
-        self.root.after(0, lambda: self._update_log(message))
+        # Safe from any thread; the Tk thread picks it up on the next frame
+        self.log_sink.write(message)
+
+    def _drain_log(self):
+        batch = self.log_sink.drain(LOG_BATCH)
+        if self.log_sink.dropped > self.reported_drops:
+            batch.append(f"[log] {self.log_sink.dropped - self.reported_drops} lines dropped under load")
+            self.reported_drops = self.log_sink.dropped
+        if batch:
+            self._update_log("\n".join(batch))
+        self.root.after(LOG_FRAME_MS, self._drain_log)
 
     def _update_log(self, message):
         self.log_text.config(state="normal")
         self.log_text.insert(tk.END, message + "\n")
+        lines = int(self.log_text.index("end-1c").split(".")[0])
+        if lines > LOG_RETAINED_LINES:
+            self.log_text.delete("1.0", f"{lines - LOG_RETAINED_LINES + 1}.0")
         self.log_text.see(tk.END)
         self.log_text.config(state="disabled")
 
@@ -134,7 +197,7 @@ class GameConsoleGUI:
             burst_time = int(burst_time)
             if burst_time <= 0:
                 raise ValueError
-            self.scheduler.add_process(game_name, burst_time)
+            self.scheduler.add_process(game_name, burst_time, player=self.player_entry.get().strip() or "Player")
             log_and_display_event(f"Game '{game_name}' added with burst time {burst_time}.")
             self.log_to_gui(f"Game '{game_name}' added with burst time {burst_time}.")
             messagebox.showinfo("Success", f"Game '{game_name}' added to queue!")
@@ -154,25 +217,87 @@ class GameConsoleGUI:
         self.queue_text.config(state="disabled")
         self.update_remove_combo()
 
+    def _score_line(self, game):
+        top = self.file_system.leaderboard.top_scores(game, 3)
+        best = self.file_system.high_scores.get(game, top[0][1] if top else 0)
+        leaders = ", ".join(f"{player} {score}" for player, score in top)
+        return f"{game}: {best}" + (f"  [{leaders}]" if leaders else "")
+
     def view_scores(self):
+        # After the first render only games whose leaderboard changed are redrawn
+        high_scores = self.file_system.high_scores
+        changed = self.file_system.leaderboard.pop_changed()
         self.scores_text.config(state="normal")
-        self.scores_text.delete("1.0", tk.END)
-        if not self.scheduler.file_system.high_scores:
+        if not high_scores and not changed:
+            self.scores_text.delete("1.0", tk.END)
             self.scores_text.insert(tk.END, "No high scores yet.")
+            self.score_lines = {}
+        elif not self.score_lines:
+            self.scores_text.delete("1.0", tk.END)
+            for game in list(high_scores) + sorted(changed - set(high_scores)):
+                self.score_lines[game] = len(self.score_lines) + 1
+                self.scores_text.insert(tk.END, self._score_line(game) + "\n")
         else:
-            for game, score in self.scheduler.file_system.high_scores.items():
-                self.scores_text.insert(tk.END, f"{game}: {score}\n")
+            for game in sorted(changed):
+                line = self.score_lines.get(game)
+                if line is None:
+                    line = self.score_lines[game] = len(self.score_lines) + 1
+                    self.scores_text.insert(f"{line}.0", self._score_line(game) + "\n")
+                else:
+                    self.scores_text.delete(f"{line}.0", f"{line}.end")
+                    self.scores_text.insert(f"{line}.0", self._score_line(game))
         self.scores_text.config(state="disabled")
 
     def view_memory(self):
         self.memory_text.config(state="normal")
         self.memory_text.delete("1.0", tk.END)
-        used = sum(1 for _ in range(self.memory_manager.total_pages) if _ not in self.memory_manager.free_pages)
+        used = self.memory_manager.used_pages
         bar = '█' * (used * 30 // self.memory_manager.total_pages) + '-' * ((self.memory_manager.total_pages - used) * 30 // self.memory_manager.total_pages)
         percent = int(100 * (used / self.memory_manager.total_pages))
         memory_str = f"Used Memory: |{bar}| {percent}% pages\nFree Pages: {self.memory_manager.free_pages}"
         self.memory_text.insert(tk.END, memory_str)
         self.memory_text.config(state="disabled")
+        self.view_cpus()
+
+    def view_cpus(self):
+        self.cpu_text.config(state="normal")
+        self.cpu_text.delete("1.0", tk.END)
+        lines = []
+        for core in self.scheduler.cpu_utilization():
+            bar = '█' * int(core["utilization"] * 20) + '-' * (20 - int(core["utilization"] * 20))
+            lines.append(f"CPU {core['cpu']}: |{bar}| {int(core['utilization'] * 100)}% busy, {core['queued']} queued")
+        self.cpu_text.insert(tk.END, "\n".join(lines))
+        self.cpu_text.config(state="disabled")
+
+    def toggle_tracing(self):
+        tracer.enable(not tracer.enabled)
+        self.trace_button.config(text=f"Trace: {'On' if tracer.enabled else 'Off'}")
+        self.log_to_gui(f"Tracing {'enabled' if tracer.enabled else 'disabled'}")
+        self._show_metrics()
+
+    def export_trace(self):
+        events = tracer.export_chrome_trace(TRACE_FILE)
+        messagebox.showinfo("Trace", f"Wrote {events} trace events to {TRACE_FILE}")
+
+    def _refresh_metrics(self):
+        if tracer.enabled:
+            self._show_metrics()
+        self.root.after(METRICS_FRAME_MS, self._refresh_metrics)
+
+    def _show_metrics(self):
+        snapshot = tracer.snapshot()
+        lines = [f"{name:<28} n={stats['count']:<7} avg={stats['avg']:.1f}us p99={stats['p99']:.0f}us"
+                 for name, stats in sorted(snapshot["histograms"].items(), key=lambda item: -item[1]["count"])]
+        counters = ", ".join(f"{name.split('.')[-1]}={value}" for name, value in sorted(snapshot["counters"].items()))
+        if counters:
+            lines.insert(0, counters)
+        self.metrics_text.config(state="normal")
+        self.metrics_text.delete("1.0", tk.END)
+        self.metrics_text.insert(tk.END, "\n".join(lines) or ("No samples yet" if tracer.enabled else "Tracing is off"))
+        self.metrics_text.config(state="disabled")
+
+    def change_policy(self, event=None):
+        self.scheduler.set_policy(self.policy_combo.get())
 
     def clear_queue(self):
         self.scheduler.clear_queue()
@@ -201,9 +326,14 @@ class GameConsoleGUI:
         self.view_memory()
 
     def run_scheduler(self):
+        if self.async_bridge is not None:
+            self.async_bridge.create_task(self._run_scheduler_async())
+            return
+
         def scheduler_task():
             show_loading_animation()
             self.scheduler.run()
+            display_cpu_map(self.scheduler)
             self.root.after(0, self.view_queue)
             self.root.after(0, self.view_scores)
             self.root.after(0, self.view_memory)
@@ -211,10 +341,22 @@ class GameConsoleGUI:
         
         threading.Thread(target=scheduler_task, daemon=True).start()
 
+    async def _run_scheduler_async(self):
+        # Runs on the Tk thread between frames, so widgets can be updated directly
+        await self.scheduler.run_async()
+        display_cpu_map(self.scheduler)
+        self.view_queue()
+        self.view_scores()
+        self.view_memory()
+        self.root.after(0, lambda: messagebox.showinfo("Scheduler", "Scheduler run complete!"))  # Modal, so not inside the loop
+
     def exit(self):
+        if self.async_bridge is not None:
+            self.async_bridge.close()
+        self.file_system.close()  # Flush buffered score files before quitting
         self.root.quit()
 
 if __name__ == "__main__":
     root = tk.Tk()
-    app = GameConsoleGUI(root)
+    app = GameConsoleGUI(root, engine="async" if "--async" in sys.argv[1:] else "threads")
     root.mainloop()
\ No newline at end of file
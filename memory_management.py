@@ -1,35 +1,677 @@
+import heapq
+import re
+import sys
+import time
+from array import array
+from instrumentation import tracer
+from page_replacement import make_replacement
+from tlb import TLB
+
+# Page table entries are packed ints: frame number << FLAG_BITS | flag bits
+PRESENT = 1
+REFERENCED = 2
+DIRTY = 4
+FLAG_BITS = 3
+BATCH_WINDOW = 256  # Initial accesses checked per vectorized step while demand paging; doubles while no fault shows up
+
+def _numpy():
+    # NumPy is optional and only needed by translate_many
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("MemoryManager.translate_many needs NumPy (pip install numpy)") from e
+    return numpy
+
+class BitmapFrameAllocator:
+    # One byte per frame (1 = in use). Frames are handed out lowest-first like the old
+    # sorted free list; _hint is a lower bound on the first free frame so the C-level
+    # bytearray.find never rescans the packed prefix.
+    def __init__(self, total_frames):
+        self.total_frames = total_frames
+        self.bitmap = bytearray(total_frames)
+        self.used = 0
+        self._hint = 0
+
+    def allocate(self, count):
+        if self.total_frames - self.used < count:
+            return None
+        frames = []
+        pos = self._hint
+        while len(frames) < count:
+            pos = self.bitmap.find(0, pos)
+            self.bitmap[pos] = 1
+            frames.append(pos)
+            pos += 1
+        self._hint = pos
+        self.used += count
+        return frames
+
+    def free(self, frames):
+        for frame in frames:
+            self.bitmap[frame] = 0
+        self.used -= len(frames)
+        if frames:
+            self._hint = min(self._hint, min(frames))
+
+    def free_frames(self):
+        return [frame for frame, in_use in enumerate(self.bitmap) if not in_use]
+
+    def reserve_many(self, blocks):
+        # Marks specific frames in use, e.g. when rebuilding from restored page tables. All or
+        # nothing: returns False without changing anything if a frame is out of range, taken
+        # or listed twice. Frames are claimed a contiguous run at a time with slice writes.
+        frames = sorted(frame for block in blocks for frame in block)
+        runs, start = [], 0
+        for i in range(1, len(frames) + 1):
+            if i == len(frames) or frames[i] != frames[i - 1] + 1:
+                runs.append((frames[start], frames[i - 1] + 1))
+                start = i
+        end = 0  # Runs are sorted, so a negative or duplicate frame starts a run before this
+        for first, last in runs:
+            if first < end or last > self.total_frames or self.bitmap.find(1, first, last) != -1:
+                return False
+            end = last
+        for first, last in runs:
+            self.bitmap[first:last] = b"\x01" * (last - first)
+        self.used += len(frames)
+        return True
+
+    def fragmentation(self):
+        free = self.total_frames - self.used
+        runs = [m.end() - m.start() for m in re.finditer(b"\x00+", self.bitmap)]
+        largest = max(runs, default=0)
+        return {
+            "free_frames": free,
+            "used_frames": self.used,
+            "free_runs": len(runs),
+            "largest_free_run": largest,
+            "external_fragmentation": 1 - largest / free if free else 0.0,
+            "internal_fragmentation": 0,
+        }
+
+class BuddyFrameAllocator:
+    # Binary buddy system: every allocation is a contiguous, aligned run of 2**order frames.
+    # Free blocks live in a set per order (O(1) buddy lookup) plus a min-heap per order so
+    # the lowest address is reused first; heap entries missing from the set are stale.
+    def __init__(self, total_frames):
+        self.total_frames = total_frames
+        self.max_order = max(0, total_frames.bit_length() - 1)
+        self.free_sets = [set() for _ in range(self.max_order + 1)]
+        self.free_heaps = [[] for _ in range(self.max_order + 1)]
+        self.block_order = {}  # Start frame of each allocated block -> order
+        self.used = 0  # Frames reserved, including rounding up to a power of two
+        self.requested = 0
+        start = 0
+        while start < total_frames:
+            order = self.max_order
+            while start % (1 << order) or start + (1 << order) > total_frames:
+                order -= 1
+            self._push_free(start, order)
+            start += 1 << order
+
+    def _push_free(self, start, order):
+        self.free_sets[order].add(start)
+        heapq.heappush(self.free_heaps[order], start)
+
+    def _pop_free(self, order):
+        heap, free = self.free_heaps[order], self.free_sets[order]
+        while heap:
+            start = heapq.heappop(heap)
+            if start in free:
+                free.remove(start)
+                return start
+        return None
+
+    def allocate(self, count):
+        if count <= 0:
+            return []
+        order = (count - 1).bit_length()
+        for current in range(order, self.max_order + 1):
+            start = self._pop_free(current)
+            if start is not None:
+                break
+        else:
+            return None
+        while current > order:  # Split, keeping the lower half and freeing its buddy
+            current -= 1
+            self._push_free(start + (1 << current), current)
+        self.block_order[start] = order
+        self.used += 1 << order
+        self.requested += count
+        return list(range(start, start + count))
+
+    def free(self, frames):
+        if not frames:
+            return
+        start = frames[0]
+        order = self.block_order.pop(start)
+        self.used -= 1 << order
+        self.requested -= len(frames)
+        while order < self.max_order:
+            buddy = start ^ (1 << order)
+            if buddy not in self.free_sets[order]:
+                break
+            self.free_sets[order].remove(buddy)  # Its heap entry goes stale
+            start = min(start, buddy)
+            order += 1
+        self._push_free(start, order)
+
+    def reserve_many(self, blocks):
+        # Claims blocks previous allocate() calls returned, e.g. when rebuilding from restored
+        # page tables. All or nothing: if one is not free the ones already claimed are freed
+        # again and False is returned.
+        for count, frames in enumerate(blocks):
+            if not self._reserve(frames):
+                for claimed in blocks[:count]:
+                    self.free(claimed)
+                return False
+        return True
+
+    def _reserve(self, frames):
+        # Splits the free block that contains frames; returns False if it is not free
+        if not frames:
+            return True
+        start, order = frames[0], (len(frames) - 1).bit_length()
+        if start % (1 << order):
+            return False
+        for current in range(order, self.max_order + 1):
+            block = start & ~((1 << current) - 1)
+            if block in self.free_sets[current]:
+                break
+        else:
+            return False
+        self.free_sets[current].remove(block)  # Its heap entry goes stale
+        while current > order:  # Split, freeing whichever half does not hold start
+            current -= 1
+            if start & (1 << current):
+                self._push_free(block, current)
+                block += 1 << current
+            else:
+                self._push_free(block + (1 << current), current)
+        self.block_order[start] = order
+        self.used += 1 << order
+        self.requested += len(frames)
+        return True
+
+    def free_frames(self):
+        return sorted(frame for order, starts in enumerate(self.free_sets)
+                      for start in starts for frame in range(start, start + (1 << order)))
+
+    def fragmentation(self):
+        free = self.total_frames - self.used
+        largest = max((1 << order for order, starts in enumerate(self.free_sets) if starts), default=0)
+        return {
+            "free_frames": free,
+            "used_frames": self.used,
+            "free_runs": sum(len(starts) for starts in self.free_sets),
+            "largest_free_run": largest,
+            "external_fragmentation": 1 - largest / free if free else 0.0,
+            "internal_fragmentation": self.used - self.requested,
+        }
+
+FRAME_ALLOCATORS = {"bitmap": BitmapFrameAllocator, "buddy": BuddyFrameAllocator}
+
+class FlatPageTable:
+    # One packed 64-bit entry per virtual page; memory grows linearly with virtual size
+    def __init__(self, num_pages):
+        self.entries = array("q", bytes(8 * num_pages))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, page):
+        return self.entries[page]
+
+    def set(self, page, entry):
+        self.entries[page] = entry
+
+    def resident(self):
+        return [(page, entry >> FLAG_BITS) for page, entry in enumerate(self.entries) if entry & PRESENT]
+
+    def nbytes(self):
+        return sys.getsizeof(self.entries)
+
+class TwoLevelPageTable:
+    # Page directory of lazily allocated leaf arrays, so untouched regions of a large
+    # sparse address space cost one directory slot per 2**leaf_bits pages
+    def __init__(self, num_pages, leaf_bits=10):
+        self.num_pages = num_pages
+        self.leaf_bits = leaf_bits
+        self.leaf_mask = (1 << leaf_bits) - 1
+        self.directory = [None] * ((num_pages + self.leaf_mask) >> leaf_bits)
+
+    def __len__(self):
+        return self.num_pages
+
+    def get(self, page):
+        leaf = self.directory[page >> self.leaf_bits]
+        return leaf[page & self.leaf_mask] if leaf is not None else 0
+
+    def set(self, page, entry):
+        index = page >> self.leaf_bits
+        leaf = self.directory[index]
+        if leaf is None:
+            if not entry:
+                return
+            leaf = self.directory[index] = array("q", bytes(8 << self.leaf_bits))
+        leaf[page & self.leaf_mask] = entry
+
+    def resident(self):
+        pages = []
+        for index, leaf in enumerate(self.directory):
+            if leaf is not None:
+                base = index << self.leaf_bits
+                pages.extend((base + offset, entry >> FLAG_BITS) for offset, entry in enumerate(leaf) if entry & PRESENT)
+        return pages
+
+    def nbytes(self):
+        return sys.getsizeof(self.directory) + sum(sys.getsizeof(leaf) for leaf in self.directory if leaf is not None)
+
+class InvertedPageTable:
+    # One entry per physical frame, shared by every process: owner pid/page, flags and a
+    # hash-chain link. A hash anchor table maps hash(pid, page) to the first frame of its
+    # chain, so lookups are O(1) on average and memory depends only on physical size.
+    def __init__(self, total_frames):
+        self.anchor_mask = (1 << max(1, total_frames - 1).bit_length()) - 1
+        self.anchors = array("q", [-1]) * (self.anchor_mask + 1)
+        self.owner_pid = array("q", [-1]) * total_frames
+        self.owner_page = array("q", [0]) * total_frames
+        self.flags = bytearray(total_frames)
+        self.next = array("q", [-1]) * total_frames
+
+    def _bucket(self, pid, page):
+        return (page * 0x9E3779B1 ^ pid * 0x85EBCA6B) & self.anchor_mask
+
+    def lookup(self, pid, page):
+        frame = self.anchors[self._bucket(pid, page)]
+        while frame != -1:
+            if self.owner_page[frame] == page and self.owner_pid[frame] == pid:
+                return frame << FLAG_BITS | self.flags[frame]
+            frame = self.next[frame]
+        return 0
+
+    def unmap(self, pid, page):
+        bucket = self._bucket(pid, page)
+        previous, frame = -1, self.anchors[bucket]
+        while frame != -1:
+            if self.owner_page[frame] == page and self.owner_pid[frame] == pid:
+                if previous == -1:
+                    self.anchors[bucket] = self.next[frame]
+                else:
+                    self.next[previous] = self.next[frame]
+                self.owner_pid[frame] = -1
+                self.flags[frame] = 0
+                self.next[frame] = -1
+                return
+            previous, frame = frame, self.next[frame]
+
+    def map(self, pid, page, entry):
+        frame = entry >> FLAG_BITS
+        if self.owner_pid[frame] == pid and self.owner_page[frame] == page:
+            self.flags[frame] = entry & ((1 << FLAG_BITS) - 1)
+            return
+        self.unmap(pid, page)
+        if self.owner_pid[frame] != -1:  # Frame still mapped elsewhere, unlink it first
+            self.unmap(self.owner_pid[frame], self.owner_page[frame])
+        bucket = self._bucket(pid, page)
+        self.owner_pid[frame] = pid
+        self.owner_page[frame] = page
+        self.flags[frame] = entry & ((1 << FLAG_BITS) - 1)
+        self.next[frame] = self.anchors[bucket]
+        self.anchors[bucket] = frame
+
+    def resident(self, pid):
+        return [(self.owner_page[frame], frame) for frame in range(len(self.owner_pid)) if self.owner_pid[frame] == pid]
+
+    def nbytes(self):
+        return sum(sys.getsizeof(part) for part in (self.anchors, self.owner_pid, self.owner_page, self.flags, self.next))
+
+class InvertedPageTableView:
+    # Per-process handle onto the shared InvertedPageTable, with the same interface as
+    # FlatPageTable so MemoryManager does not care which layout is in use
+    def __init__(self, table, pid, num_pages):
+        self.table = table
+        self.pid = pid
+        self.num_pages = num_pages
+
+    def __len__(self):
+        return self.num_pages
+
+    def get(self, page):
+        return self.table.lookup(self.pid, page)
+
+    def set(self, page, entry):
+        if entry & PRESENT:
+            self.table.map(self.pid, page, entry)
+        else:
+            self.table.unmap(self.pid, page)
+
+    def resident(self):
+        return self.table.resident(self.pid)
+
+    def nbytes(self):
+        return sys.getsizeof(self)
+
+PAGE_TABLE_LAYOUTS = ("flat", "two-level", "inverted")
+
 class MemoryManager:
-    def __init__(self, total_pages=16, page_size=1024):
+    def __init__(self, total_pages=16, page_size=1024, allocator="bitmap", demand_paging=False, replacement="lru", trace=None,
+                 tlb_entries=0, tlb_ways=4, tlb_tagged=True, page_table="flat"):
         self.total_pages = total_pages
         self.page_size = page_size
-        self.free_pages = list(range(total_pages))
+        if allocator not in FRAME_ALLOCATORS:
+            raise ValueError(f"Unknown frame allocator '{allocator}'. Choose from: {', '.join(FRAME_ALLOCATORS)}")
+        self.frames = FRAME_ALLOCATORS[allocator](total_pages)
+        if page_table not in PAGE_TABLE_LAYOUTS:
+            raise ValueError(f"Unknown page table layout '{page_table}'. Choose from: {', '.join(PAGE_TABLE_LAYOUTS)}")
+        self.page_table_layout = page_table
+        self.inverted_table = InvertedPageTable(total_pages) if page_table == "inverted" else None
         self.page_tables = {}
+        # With demand paging a process gets an empty page table and frames are loaded on
+        # first touch, evicting a victim chosen by the replacement policy when memory is full
+        self.demand_paging = demand_paging
+        self.replacement = make_replacement(replacement, trace) if demand_paging else None
+        self.page_faults = 0
+        self.page_hits = 0
+        self.evictions = 0
+        self.writebacks = 0
+        self.touched = None  # Pids whose page table changed, while a Checkpointer is tracking them
+        # Opt-in: in Python a TLB probe costs about as much as the page-table walk it saves
+        self.tlb = TLB(tlb_entries, tlb_ways, tlb_tagged) if tlb_entries else None
+
+    @property
+    def free_pages(self):
+        return self.frames.free_frames()
+
+    @property
+    def used_pages(self):
+        return self.frames.used
+
+    def fragmentation(self):
+        return self.frames.fragmentation()
+
+    def paging_stats(self):
+        accesses = self.page_faults + self.page_hits
+        return {
+            "page_faults": self.page_faults,
+            "page_hits": self.page_hits,
+            "evictions": self.evictions,
+            "writebacks": self.writebacks,
+            "fault_rate": self.page_faults / accesses if accesses else 0.0,
+        }
+
+    def _new_page_table(self, pid, num_pages):
+        if self.page_table_layout == "two-level":
+            return TwoLevelPageTable(num_pages)
+        if self.page_table_layout == "inverted":
+            return InvertedPageTableView(self.inverted_table, pid, num_pages)
+        return FlatPageTable(num_pages)
+
+    def mapped_entries(self, pids=None):
+        # (pid, page, packed entry) for every present page of the given processes (default
+        # all), e.g. for checkpoints. The inverted layout is scanned once rather than per process,
+        # unless only some processes are asked for.
+        if self.inverted_table is not None and pids is None:
+            table = self.inverted_table
+            return [(table.owner_pid[frame], table.owner_page[frame], frame << FLAG_BITS | table.flags[frame])
+                    for frame in range(len(table.owner_pid))
+                    if table.owner_pid[frame] != -1]
+        tables = self.page_tables if pids is None else {pid: self.page_tables[pid] for pid in pids if pid in self.page_tables}
+        if self.inverted_table is not None:
+            return [(pid, page, entry) for pid, table in tables.items()
+                    for page, entry in enumerate(map(table.get, range(len(table)))) if entry & PRESENT]
+        return [(pid, page, table.get(page)) for pid, table in tables.items() for page, _ in table.resident()]
+
+    def restore_page_tables(self, tables):
+        # Rebuilds page tables from checkpointed (pid, virtual pages, [page, entry, page, entry, ...]);
+        # the caller reserves the frames themselves with frames.reserve_many()
+        page_tables, new_table = self.page_tables, self._new_page_table
+        loaded = self.replacement.loaded if self.replacement is not None else None
+        for pid, num_pages, entries in tables:
+            table = page_tables[pid] = new_table(pid, num_pages)
+            for page, entry in zip(entries[::2], entries[1::2]):
+                table.set(page, entry)
+                if loaded is not None:
+                    loaded((pid, page))
+
+    def page_table_bytes(self):
+        total = sum(table.nbytes() for table in self.page_tables.values())
+        return total + (self.inverted_table.nbytes() if self.inverted_table is not None else 0)
 
     def allocate_memory(self, pcb):
-        if len(self.free_pages) >= pcb.pages_needed:
-            pcb.pages = self.free_pages[:pcb.pages_needed]
-            self.free_pages = self.free_pages[pcb.pages_needed:]
-            self.page_tables[pcb.pid] = pcb.pages
-            print(f"Allocated {pcb.pages_needed} pages to {pcb.name}: {pcb.pages}")
-            return True
-        else:
-            print(f"Not enough memory for {pcb.name}")
-            return False
+        if self.touched is not None:
+            self.touched.add(pcb.pid)
+        with tracer.span("memory.allocate", pid=pcb.pid, pages=pcb.pages_needed):
+            if self.demand_paging:
+                self.page_tables[pcb.pid] = self._new_page_table(pcb.pid, pcb.pages_needed)
+                pcb.pages = []
+                tracer.emit("Reserved %d virtual pages for %s (demand paged)", pcb.pages_needed, pcb.name)
+                return True
+            pages = self.frames.allocate(pcb.pages_needed)
+            if pages is not None:
+                pcb.pages = pages
+                table = self._new_page_table(pcb.pid, len(pages))
+                for page, frame in enumerate(pages):
+                    table.set(page, frame << FLAG_BITS | PRESENT)
+                self.page_tables[pcb.pid] = table
+                tracer.emit("Allocated %d pages to %s: %s", pcb.pages_needed, pcb.name, pcb.pages)
+                return True
+            else:
+                tracer.count("memory.allocation_failures")
+                tracer.emit("Not enough memory for %s", pcb.name)
+                return False
 
     def deallocate_memory(self, pcb):
-        self.free_pages.extend(pcb.pages)
-        self.free_pages.sort()
-        del self.page_tables[pcb.pid]
-        print(f"Deallocated pages {pcb.pages} from {pcb.name}")
+        start = time.perf_counter() if tracer.enabled else None
+        table = self.page_tables.pop(pcb.pid)
+        if self.touched is not None:
+            self.touched.add(pcb.pid)
+        if self.demand_paging:
+            pcb.pages = []
+            for page, frame in table.resident():
+                self.replacement.removed((pcb.pid, page))
+                table.set(page, 0)  # Releases the shared slot when the table is inverted
+                self.frames.free([frame])
+                pcb.pages.append(frame)
+        else:
+            if self.inverted_table is not None:
+                for page, _ in table.resident():
+                    table.set(page, 0)
+            self.frames.free(pcb.pages)
+        if self.tlb is not None:
+            self.tlb.flush(pcb.pid)
+        tracer.emit("Deallocated pages %s from %s", pcb.pages, pcb.name)
         pcb.pages = []
+        if start is not None:
+            tracer.span_end("memory.deallocate", start, pid=pcb.pid)
+
+    def test_and_clear_referenced(self, pid, page):
+        if self.touched is not None:
+            self.touched.add(pid)
+        table = self.page_tables[pid]
+        entry = table.get(page)
+        table.set(page, entry & ~REFERENCED)
+        if self.tlb is not None:
+            self.tlb.invalidate(pid, page)  # So the next access walks the table and sets the bit again
+        return bool(entry & REFERENCED)
+
+    def _evict(self):
+        pid, page = self.replacement.victim(self)
+        if self.touched is not None:
+            self.touched.add(pid)
+        table = self.page_tables[pid]
+        entry = table.get(page)
+        if entry & DIRTY:
+            self.writebacks += 1  # Simulated swap-out of the modified page
+        table.set(page, 0)
+        if self.tlb is not None:
+            self.tlb.invalidate(pid, page)
+        self.evictions += 1
+        return entry >> FLAG_BITS
+
+    def _handle_page_fault(self, pid, page):
+        self.page_faults += 1
+        tracer.count("memory.page_faults")
+        if self.touched is not None:
+            self.touched.add(pid)
+        frames = self.frames.allocate(1)
+        if frames is not None:
+            frame = frames[0]
+        elif self.replacement.resident:
+            frame = self._evict()
+        else:
+            return None
+        self.replacement.loaded((pid, page))
+        return frame << FLAG_BITS | PRESENT
+
+    def context_switch(self, pid):
+        start = time.perf_counter() if tracer.enabled else None
+        if self.tlb is not None:
+            self.tlb.switch_to(pid)
+        if start is not None:
+            tracer.span_end("memory.context_switch", start, pid=pid)
+
+    def _walk(self, pid, page, write):
+        table = self.page_tables.get(pid)
+        if table is None or not 0 <= page < len(table):
+            return None
+        entry = table.get(page)
+        if entry & PRESENT:
+            self.page_hits += 1
+            if self.replacement:
+                self.replacement.accessed((pid, page))
+        else:
+            entry = self._handle_page_fault(pid, page)
+            if entry is None:
+                return None
+        entry |= REFERENCED | (DIRTY if write else 0)
+        table.set(page, entry)
+        if self.touched is not None:
+            self.touched.add(pid)
+        frame = entry >> FLAG_BITS
+        if self.tlb is not None:
+            self.tlb.insert(pid, page, frame, bool(entry & DIRTY))
+        return frame
+
+    def translate(self, pid, virtual_address, write=False):
+        # Fast path: returns the physical address (or None) without building a message
+        start = time.perf_counter() if tracer.enabled else None
+        page, offset = divmod(virtual_address, self.page_size)
+        if self.tlb is not None:
+            value = self.tlb.lookup(pid, page)
+            if value is not None and (value & 1 or not write):
+                self.page_hits += 1
+                if self.replacement:
+                    self.replacement.accessed((pid, page))
+                if start is not None:
+                    tracer.span_end("memory.translate", start)
+                return (value >> 1) * self.page_size + offset
+        frame = self._walk(pid, page, write)
+        if start is not None:
+            tracer.span_end("memory.translate", start)
+        if frame is None:
+            return None
+        return frame * self.page_size + offset
+
+    def translate_many(self, pairs, write=False):
+        # Batch form of translate() for trace replay: `pairs` is an (n, 2) array of (pid,
+        # virtual address) and `write` a bool or per-access bool array. Returns (physical,
+        # faults): int64 physical addresses (-1 where translate() would return None) and a
+        # bool mask of the accesses that took a page fault. Flat page tables are read in
+        # place through NumPy views of their arrays. With demand paging each fault is handled
+        # by the scalar path at its position in the trace, so faults, evictions and
+        # replacement order match a translate() loop; TLB lookups and stats are bypassed.
+        np = _numpy()
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        count = len(pairs)
+        pids, addresses = pairs[:, 0], pairs[:, 1]
+        writes = np.broadcast_to(np.asarray(write, dtype=bool), (count,))
+        pages, offsets = np.divmod(addresses, self.page_size)
+        physical = np.full(count, -1, dtype=np.int64)
+        faults = np.zeros(count, dtype=bool)
+        with tracer.span("memory.translate_many", count=count):
+            if self.page_table_layout != "flat":
+                for i in range(count):
+                    self._translate_one(i, pids, addresses, writes, physical, faults)
+                return physical, faults
+            start, window, scalar_run = 0, BATCH_WINDOW if self.demand_paging else count, BATCH_WINDOW // 4
+            while start < count:
+                end = min(count, start + window)
+                entries = self._gather_entries(np, pids[start:end], pages[start:end])
+                present = (entries & PRESENT) != 0
+                # Without demand paging nothing changes mid-batch; with it, stop at the first miss
+                stop = end if not self.demand_paging or present.all() else start + int(np.argmin(present))
+                hits = np.flatnonzero(present[:stop - start]) + start
+                if len(hits):
+                    self._record_hits(np, pids[hits], pages[hits], writes[hits])
+                    physical[hits] = (entries[hits - start] >> FLAG_BITS) * self.page_size + offsets[hits]
+                if stop < end:
+                    self._translate_one(stop, pids, addresses, writes, physical, faults)
+                    run, start = stop - start, stop + 1
+                    if run >= BATCH_WINDOW // 8:
+                        window, scalar_run = max(BATCH_WINDOW, 2 * run), BATCH_WINDOW // 4
+                        continue
+                    # Faults too dense for vectorizing to pay off: take a growing stretch scalar
+                    end = min(count, start + scalar_run)
+                    for i in range(start, end):
+                        self._translate_one(i, pids, addresses, writes, physical, faults)
+                    start, window, scalar_run = end, BATCH_WINDOW, min(2 * scalar_run, 1 << 12)
+                else:
+                    start, window = end, min(2 * window, 1 << 16)
+        return physical, faults
+
+    def _translate_one(self, i, pids, addresses, writes, physical, faults):
+        page_faults = self.page_faults
+        address = self.translate(int(pids[i]), int(addresses[i]), bool(writes[i]))
+        physical[i] = -1 if address is None else address
+        faults[i] = self.page_faults > page_faults
+
+    def _pid_groups(self, np, pids):
+        # (page table, indices into pids) per distinct pid that has a table
+        order = np.argsort(pids, kind="stable")
+        bounds = np.flatnonzero(np.diff(pids[order])) + 1
+        groups = []
+        for indices in np.split(order, bounds):
+            table = self.page_tables.get(int(pids[indices[0]])) if len(indices) else None
+            if table is not None:
+                groups.append((table, indices))
+        return groups
+
+    def _gather_entries(self, np, pids, pages):
+        entries = np.zeros(len(pids), dtype=np.int64)
+        for table, indices in self._pid_groups(np, pids):
+            view = np.frombuffer(table.entries, dtype=np.int64)
+            table_pages = pages[indices]
+            valid = (table_pages >= 0) & (table_pages < len(view))
+            entries[indices[valid]] = view[table_pages[valid]]
+        return entries
+
+    def _record_hits(self, np, pids, pages, writes):
+        # Same side effects as a run of translate() hits: counters, PTE bits, replacement order
+        self.page_hits += len(pids)
+        groups = self._pid_groups(np, pids)
+        if self.touched is not None:
+            self.touched.update(int(pids[indices[0]]) for _, indices in groups)
+        for table, indices in groups:
+            view = np.frombuffer(table.entries, dtype=np.int64)
+            view[pages[indices]] |= REFERENCED
+            view[pages[indices[writes[indices]]]] |= DIRTY
+        if self.replacement:
+            self.replacement.accessed_many(zip(pids.tolist(), pages.tolist()))
+
+    def translate_address(self, pid, virtual_address, write=False):
+        faults = self.page_faults
+        physical_address = self.translate(pid, virtual_address, write)
+        page, offset = divmod(virtual_address, self.page_size)
+        if physical_address is None:
+            if pid not in self.page_tables:
+                return None, "No page table for PID"
+            if not 0 <= page < len(self.page_tables[pid]):
+                return None, "Invalid page number"
+            return None, "Out of physical memory"
+        frame = physical_address // self.page_size
+        message = f"Virtual address {virtual_address} -> Physical address {physical_address} (Page {frame}, Offset {offset})"
+        return physical_address, message + (" [page fault]" if self.page_faults > faults else "")
 
-    def translate_address(self, pid, virtual_address):
-        if pid not in self.page_tables:
-            return None, "No page table for PID"
-        pages = self.page_tables[pid]
-        page = virtual_address // self.page_size
-        offset = virtual_address % self.page_size
-        if page >= len(pages):
-            return None, "Invalid page number"
-        physical_address = (pages[page] * self.page_size) + offset
-        return physical_address, f"Virtual address {virtual_address} -> Physical address {physical_address} (Page {pages[page]}, Offset {offset})"
\ No newline at end of file
+    def tlb_stats(self):
+        return self.tlb.stats() if self.tlb is not None else None
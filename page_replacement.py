@@ -0,0 +1,112 @@
+import heapq
+from collections import OrderedDict
+
+# Replacement policies track resident pages by (pid, virtual page) key. MemoryManager calls
+# loaded() after a page fault brings a page in, accessed() on every hit (accessed_many()
+# for a run of hits in trace order, from translate_many), removed() when a process frees
+# its memory, and victim() when it needs a frame back.
+
+class FIFOReplacement:
+    name = "fifo"
+
+    def __init__(self):
+        self.resident = OrderedDict()
+
+    def loaded(self, key):
+        self.resident[key] = None
+
+    def accessed(self, key):
+        pass
+
+    def accessed_many(self, keys):
+        pass
+
+    def removed(self, key):
+        self.resident.pop(key, None)
+
+    def victim(self, memory):
+        key, _ = self.resident.popitem(last=False)
+        return key
+
+class LRUReplacement(FIFOReplacement):
+    name = "lru"
+
+    def accessed(self, key):
+        self.resident.move_to_end(key)
+
+    def accessed_many(self, keys):
+        # Only each key's last access decides the final order
+        for key in reversed(dict.fromkeys(reversed(list(keys)))):
+            self.resident.move_to_end(key)
+
+class ClockReplacement(FIFOReplacement):
+    # Second-chance FIFO: the hand skips (and clears) pages whose PTE referenced bit is set
+    name = "clock"
+
+    def victim(self, memory):
+        while True:
+            key = next(iter(self.resident))
+            if memory.test_and_clear_referenced(*key):
+                self.resident.move_to_end(key)
+            else:
+                del self.resident[key]
+                return key
+
+class OptimalReplacement:
+    # Belady's algorithm for offline traces: evict the page whose next use is farthest away.
+    # The trace must list the (pid, virtual page) keys in the order they will be translated.
+    name = "optimal"
+
+    def __init__(self, trace):
+        self.next_use = [0] * len(trace)
+        last_seen = {}
+        for i in range(len(trace) - 1, -1, -1):
+            self.next_use[i] = last_seen.get(trace[i], float("inf"))
+            last_seen[trace[i]] = i
+        self.position = 0
+        self.resident = {}
+        self._heap = []  # (-next use, key); entries whose next use has changed are stale
+
+    def _reference(self, key):
+        next_use = self.next_use[self.position] if self.position < len(self.next_use) else float("inf")
+        self.position += 1
+        self.resident[key] = next_use
+        heapq.heappush(self._heap, (-next_use, key))
+
+    def loaded(self, key):
+        self._reference(key)
+
+    def accessed(self, key):
+        self._reference(key)
+
+    def accessed_many(self, keys):
+        for key in keys:
+            self._reference(key)
+
+    def removed(self, key):
+        self.resident.pop(key, None)
+
+    def victim(self, memory):
+        while True:
+            neg_next_use, key = heapq.heappop(self._heap)
+            if self.resident.get(key) == -neg_next_use:
+                del self.resident[key]
+                return key
+
+REPLACEMENT_POLICIES = {
+    FIFOReplacement.name: FIFOReplacement,
+    LRUReplacement.name: LRUReplacement,
+    ClockReplacement.name: ClockReplacement,
+    OptimalReplacement.name: OptimalReplacement,
+}
+
+def make_replacement(policy=None, trace=None):
+    if policy is None or not isinstance(policy, str):
+        return policy or LRUReplacement()
+    if policy not in REPLACEMENT_POLICIES:
+        raise ValueError(f"Unknown replacement policy '{policy}'. Choose from: {', '.join(REPLACEMENT_POLICIES)}")
+    if policy == OptimalReplacement.name:
+        if trace is None:
+            raise ValueError("Optimal replacement needs the future address trace")
+        return OptimalReplacement(trace)
+    return REPLACEMENT_POLICIES[policy]()
@@ -1,34 +1,278 @@
-import time
-import queue
+import heapq
+import itertools
+import random
 import threading
+import time
+from collections import deque
+from clock import RealClock, SimulatedClock
 from concurrency import GameThreadManager
+from input_channel import BACKPRESSURE_MODES, InputChannel
+from instrumentation import tracer
+from scheduling_policies import LeastRuntimePolicy, make_policies
+
+INPUT_CAPACITY = 64  # Inputs a game may have queued before backpressure applies
 
 class PCB:
-    def __init__(self, pid, name, burst_time, pages_needed=4):
+    # Slotted so a queued process stays small. The input channel and score lock are only
+    # needed once a process is dispatched, so they are created on first use.
+    __slots__ = ("pid", "name", "player", "state", "burst_time", "total_runtime", "pages", "pages_needed", "score",
+                 "affinity", "arrival_time", "first_run_time", "completion_time", "input_capacity", "backpressure",
+                 "_input_queue", "_score_lock")
+    _lazy_lock = threading.Lock()  # Guards first-use creation shared by every PCB
+
+    def __init__(self, pid, name, burst_time, pages_needed=4, player="Player", input_capacity=INPUT_CAPACITY, backpressure="drop-oldest"):
         self.pid = pid
         self.name = name
+        self.player = player
         self.state = "ready"
         self.burst_time = burst_time
         self.total_runtime = 0
         self.pages = []
         self.pages_needed = pages_needed
-        self.input_queue = queue.Queue()
+        self.input_capacity = input_capacity
+        self.backpressure = backpressure
+        self._input_queue = None
         self.score = 0
-        self.score_lock = threading.Lock()
-        self.threads = []
+        self._score_lock = None
+        self.affinity = None  # Set of CPU ids this process may run on, None for any
+        # Timestamps on the scheduler clock, used for waiting/turnaround/response metrics
+        self.arrival_time = None
+        self.first_run_time = None
+        self.completion_time = None
+
+    @property
+    def input_queue(self):
+        if self._input_queue is None:
+            with PCB._lazy_lock:
+                if self._input_queue is None:
+                    self._input_queue = InputChannel(self.input_capacity, self.backpressure)
+        return self._input_queue
+
+    @property
+    def score_lock(self):
+        if self._score_lock is None:
+            with PCB._lazy_lock:
+                if self._score_lock is None:
+                    self._score_lock = threading.Lock()
+        return self._score_lock
+
+    def input_stats(self):
+        # Channel stats without creating a channel for a process that never ran
+        if self._input_queue is None:
+            return {"depth": 0, "max_depth": 0, "capacity": self.input_capacity, "puts": 0, "gets": 0, "dropped": 0}
+        return self._input_queue.stats()
 
     def __str__(self):
         return f"{self.name} (PID: {self.pid}, State: {self.state}, Score: {self.score})"
 
+class ReadyQueue:
+    # Ordering is delegated to a SchedulingPolicy (a lazy-deletion heap by default);
+    # _by_pid keeps insertion order so iteration matches the old list semantics.
+    def __init__(self, policy=None):
+        self.policy = policy or LeastRuntimePolicy()
+        self._last_heap = []  # Max-heap on pid for remove_last, lazily cleaned
+        self._by_pid = {}
+        self._by_name = {}
+        self._seq = itertools.count()  # Tie-breaker so heap entries never compare PCBs
+        self.view = None  # RunQueueView told when this queue becomes empty or non-empty
+        self.cpu_id = None
+
+    def _notify_view(self):
+        if self.view is not None:
+            self.view.queue_changed(self)
+
+    def __len__(self):
+        return len(self._by_pid)
+
+    def __bool__(self):
+        return bool(self._by_pid)
+
+    def __iter__(self):
+        return iter(list(self._by_pid.values()))
+
+    def __contains__(self, pcb):
+        return self._by_pid.get(pcb.pid) is pcb
+
+    def append(self, pcb):
+        self._by_pid[pcb.pid] = pcb
+        self._by_name.setdefault(pcb.name, {})[pcb.pid] = pcb
+        heapq.heappush(self._last_heap, (-pcb.pid, next(self._seq), pcb))
+        self.policy.push(pcb)
+        if len(self._by_pid) == 1:
+            self._notify_view()
+
+    def extend(self, pcbs):
+        # Bulk append, e.g. restoring a checkpoint: the heaps are built once, not pushed into per process
+        was_empty = not self._by_pid
+        for pcb in pcbs:
+            self._by_pid[pcb.pid] = pcb
+            self._by_name.setdefault(pcb.name, {})[pcb.pid] = pcb
+        self._last_heap.extend((-pcb.pid, next(self._seq), pcb) for pcb in pcbs)
+        heapq.heapify(self._last_heap)
+        self.policy.push_many(pcbs)
+        if was_empty and self._by_pid:
+            self._notify_view()
+
+    def pop(self):
+        pcb = self.policy.pop()
+        self._unlink(pcb)
+        return pcb
+
+    def _unlink(self, pcb):
+        del self._by_pid[pcb.pid]
+        same_name = self._by_name[pcb.name]
+        del same_name[pcb.pid]
+        if not same_name:
+            del self._by_name[pcb.name]
+        if not self._by_pid:
+            self._notify_view()
+        # Rebuild once tombstones outnumber live entries so the heap stays O(n)
+        if len(self._last_heap) > 2 * len(self._by_pid) + 16:
+            self._last_heap = [(-p.pid, next(self._seq), p) for p in self._by_pid.values()]
+            heapq.heapify(self._last_heap)
+
+    def _remove(self, pcb):
+        self._unlink(pcb)
+        self.policy.discard(pcb)
+        return pcb
+
+    def remove(self, pcb):
+        if pcb not in self:
+            raise ValueError(f"{pcb.name} (PID: {pcb.pid}) is not in the ready queue")
+        self._remove(pcb)
+
+    def remove_by_pid(self, pid):
+        pcb = self._by_pid.get(pid)
+        return self._remove(pcb) if pcb is not None else None
+
+    def remove_by_name(self, name):
+        same_name = self._by_name.get(name)
+        if not same_name:
+            return None
+        return self._remove(next(iter(same_name.values())))  # Earliest queued process with this name
+
+    def remove_last(self):
+        while self._last_heap:
+            neg_pid, _, pcb = heapq.heappop(self._last_heap)
+            if self._by_pid.get(-neg_pid) is pcb:
+                return self._remove(pcb)
+        return None
+
+    def get(self, pid):
+        return self._by_pid.get(pid)
+
+    def peek(self):
+        return self.policy.peek() if self._by_pid else None
+
+    def peek_last(self):
+        while self._last_heap:
+            neg_pid, _, pcb = self._last_heap[0]
+            if self._by_pid.get(-neg_pid) is pcb:
+                return pcb
+            heapq.heappop(self._last_heap)
+        return None
+
+    def clear(self):
+        for pcb in list(self._by_pid.values()):
+            self.policy.discard(pcb)
+        self._last_heap.clear()
+        self._by_pid.clear()
+        self._by_name.clear()
+        self._notify_view()
+
+class CPU:
+    # A simulated core: its own run queue plus counters for utilization reporting
+    def __init__(self, cpu_id, run_queue):
+        self.cpu_id = cpu_id
+        self.run_queue = run_queue
+        self.current = None
+        self.busy_time = 0
+        self.dispatches = 0
+        self.steals = 0
+
+    def load(self):
+        return len(self.run_queue) + (1 if self.current else 0)
+
+class RunQueueView:
+    # Read-only view over every core's run queue, in core order, for display code. Only
+    # cores with queued work are visited, so checks stay cheap with thousands of cores.
+    def __init__(self, cpus):
+        self.cpus = cpus
+        self.nonempty = set()  # cpu_ids whose run queue holds work
+        for cpu in cpus:
+            self.attach(cpu)
+
+    def attach(self, cpu):
+        cpu.run_queue.view = self
+        cpu.run_queue.cpu_id = cpu.cpu_id
+        self.queue_changed(cpu.run_queue)
+
+    def queue_changed(self, run_queue):
+        if run_queue:
+            self.nonempty.add(run_queue.cpu_id)
+        else:
+            self.nonempty.discard(run_queue.cpu_id)
+
+    def busy_cpus(self):
+        return [self.cpus[cpu_id] for cpu_id in sorted(self.nonempty)]
+
+    def __len__(self):
+        return sum(len(cpu.run_queue) for cpu in self.busy_cpus())
+
+    def __bool__(self):
+        return bool(self.nonempty)
+
+    def __iter__(self):
+        return iter([pcb for cpu in self.busy_cpus() for pcb in cpu.run_queue])
+
+    def __contains__(self, pcb):
+        return any(pcb in cpu.run_queue for cpu in self.busy_cpus())
+
 class Scheduler:
-    def __init__(self, time_quantum, memory_manager, file_system, log_callback=None):
-        self.ready_queue = []
+    def __init__(self, time_quantum, memory_manager, file_system, log_callback=None, simulated=False, seed=None, policy=None, cpus=1,
+                 input_capacity=INPUT_CAPACITY, backpressure="drop-oldest"):
+        if backpressure not in BACKPRESSURE_MODES:
+            raise ValueError(f"Unknown backpressure mode '{backpressure}'. Choose from: {', '.join(BACKPRESSURE_MODES)}")
         self.time_quantum = time_quantum
         self.memory_manager = memory_manager
         self.file_system = file_system
         self.thread_managers = {}
         self.next_pid = 1
         self.log_callback = log_callback
+        # Simulation mode swaps real sleeps and game threads for a virtual clock and seeded inputs
+        self.simulated = simulated
+        self.clock = SimulatedClock() if simulated else RealClock()
+        self.rng = random.Random(seed) if simulated else None
+        self.cpus = [CPU(i, ReadyQueue(core_policy)) for i, core_policy in enumerate(make_policies(policy, cpus, self.rng))]
+        self.ready_queue = RunQueueView(self.cpus)
+        self._place_cursor = 0
+        self._arrivals = []  # Heap of (time, seq, add_process args) for simulated runs
+        self._arrival_seq = itertools.count()
+        self.completed = {}  # Policy name -> list of (waiting, turnaround, response) per finished process
+        # Guards run queues, memory and files while several cores dispatch in real time
+        self._lock = threading.RLock()
+        self._idle = threading.Condition(self._lock)
+        self._running = 0
+        self._async_loop = None  # Set while run_async() is driving the cores
+        self._async_waiters = None
+        self._run_started = None
+        self._run_elapsed = 0
+        self._worker_pool = None
+        self.dispatch_latencies = []  # Seconds from dispatch to a process's first input event
+        self.input_capacity = input_capacity
+        self.backpressure = backpressure
+        self.dropped_inputs = 0  # Inputs finished processes lost to backpressure
+        self.failed_allocations = 0  # add_process calls rejected for lack of memory
+        self.touched = None  # Pids whose PCB or core changed, while a Checkpointer is tracking them
+
+    @property
+    def worker_pool(self):
+        # Producer/consumer tasks for every core share one pool instead of spawning threads.
+        # Created on first use: concurrent.futures alone adds ~15 ms to a headless cold start.
+        if self._worker_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._worker_pool = ThreadPoolExecutor(max_workers=2 * len(self.cpus), thread_name_prefix="game")
+        return self._worker_pool
 
     def log(self, message):
         if self.log_callback:
@@ -36,88 +280,440 @@ class Scheduler:
         else:
             print(message)
 
-    def add_process(self, name, burst_time=6, pages_needed=4):
-        pcb = PCB(self.next_pid, name, burst_time, pages_needed)
-        self.next_pid += 1
-        if self.memory_manager.allocate_memory(pcb):
-            self.ready_queue.append(pcb)
-            self.thread_managers[pcb.pid] = GameThreadManager(pcb, self.log_callback)
-            self.log(f"Added {pcb.name} to ready queue")
-            self.file_system.create_file(f"{pcb.name.lower()}.txt", f"Initial score: {pcb.score}")
-        else:
+    @property
+    def policy(self):
+        return self.cpus[0].run_queue.policy
+
+    def set_policy(self, policy):
+        # Re-queue everything under the new policy, keeping the displayed queue order
+        with self._lock:
+            for cpu, core_policy in zip(self.cpus, make_policies(policy, len(self.cpus), self.rng)):
+                new_queue = ReadyQueue(core_policy)
+                for pcb in cpu.run_queue:
+                    new_queue.append(pcb)
+                cpu.run_queue = new_queue
+                self.ready_queue.attach(cpu)
+        self.log(f"Scheduling policy set to {self.policy.name}")
+
+    def _record_completion(self, cpu, pcb):
+        turnaround = pcb.completion_time - pcb.arrival_time
+        waiting = turnaround - pcb.total_runtime
+        response = pcb.first_run_time - pcb.arrival_time
+        self.completed.setdefault(cpu.run_queue.policy.name, []).append((waiting, turnaround, response))
+
+    def metrics(self):
+        report = {}
+        for name, records in self.completed.items():
+            count = len(records)
+            report[name] = {
+                "completed": count,
+                "avg_waiting": sum(r[0] for r in records) / count,
+                "avg_turnaround": sum(r[1] for r in records) / count,
+                "avg_response": sum(r[2] for r in records) / count,
+            }
+        return report
+
+    def context_switch_metrics(self):
+        latencies = self.dispatch_latencies
+        if not latencies:
+            return None
+        return {
+            "switches": len(latencies),
+            "avg_latency": sum(latencies) / len(latencies),
+            "max_latency": max(latencies),
+        }
+
+    def input_metrics(self):
+        # Per-process input queue depth and drop counters for every live process
+        with self._lock:
+            pcbs = [manager.pcb for manager in self.thread_managers.values()]
+        return {pcb.pid: dict(name=pcb.name, **pcb.input_stats()) for pcb in pcbs}
+
+    def show_metrics(self):
+        for name, stats in self.metrics().items():
+            self.log(f"[{name}] Completed: {stats['completed']}, Avg waiting: {stats['avg_waiting']:.2f}s, "
+                     f"Avg turnaround: {stats['avg_turnaround']:.2f}s, Avg response: {stats['avg_response']:.2f}s")
+        switches = self.context_switch_metrics()
+        if switches:
+            self.log(f"Context switches: {switches['switches']}, Avg dispatch latency: {switches['avg_latency'] * 1000:.2f}ms, "
+                     f"Max: {switches['max_latency'] * 1000:.2f}ms")
+        if self.dropped_inputs:
+            self.log(f"Inputs dropped by backpressure ({self.backpressure}): {self.dropped_inputs}")
+
+    def cpu_utilization(self):
+        elapsed = self._run_elapsed
+        if self._run_started is not None:
+            elapsed += self.clock.now() - self._run_started
+        return [{
+            "cpu": cpu.cpu_id,
+            "utilization": min(1.0, cpu.busy_time / elapsed) if elapsed else 0.0,
+            "dispatches": cpu.dispatches,
+            "steals": cpu.steals,
+            "queued": len(cpu.run_queue),
+        } for cpu in self.cpus]
+
+    def add_process(self, name, burst_time=6, pages_needed=4, affinity=None, player="Player"):
+        pcb = PCB(None, name, burst_time, pages_needed, player, self.input_capacity, self.backpressure)
+        pcb.affinity = set(affinity) if affinity is not None else None
+        return self.adopt_process(pcb)
+
+    def adopt_process(self, pcb):
+        # Admits a PCB built elsewhere (add_process, or one migrated from another scheduler):
+        # gives it a pid here unless it has one, allocates its memory and queues it. Returns
+        # the pcb, or None if memory is full. A migrated process keeps its pid, runtime,
+        # score and arrival time.
+        with self._lock:
+            if pcb.pid is None:
+                pcb.pid = self.next_pid
+                self.next_pid += 1
+            if self.memory_manager.allocate_memory(pcb):
+                if pcb.arrival_time is None:
+                    pcb.arrival_time = self.clock.now()
+                self._place(pcb).run_queue.append(pcb)
+                if self.touched is not None:
+                    self.touched.add(pcb.pid)
+                self.thread_managers[pcb.pid] = GameThreadManager(pcb, self.log_callback, self.rng,
+                                                                None if self.simulated else self.worker_pool)
+                self.log(f"Added {pcb.name} to ready queue")
+                self.file_system.create_file(f"{pcb.name.lower()}.txt", f"Initial score: {pcb.score}")
+                self._idle.notify_all()
+                self._wake_async_workers()
+                return pcb
+            self.failed_allocations += 1
             self.log(f"Failed to add {pcb.name} due to insufficient memory")
+            return None
+
+    def take_processes(self, count):
+        # Removes up to count queued processes, most recently added first, and releases their
+        # memory and files so they can be adopted by another scheduler
+        taken = []
+        with self._lock:
+            while len(taken) < count:
+                last = [pcb for pcb in (cpu.run_queue.peek_last() for cpu in self.cpus) if pcb is not None]
+                if not last:
+                    break
+                pcb = self._remove_queued(max(last, key=lambda x: x.pid).pid)
+                self._discard_process(pcb)
+                taken.append(pcb)
+        return taken
+
+    def add_process_at(self, timestamp, name, burst_time=6, pages_needed=4, affinity=None, player="Player"):
+        # Simulated runs only: the process arrives when virtual time reaches timestamp
+        if not self.simulated:
+            raise ValueError("Timed arrivals need a simulated scheduler (Scheduler(..., simulated=True))")
+        heapq.heappush(self._arrivals, (timestamp, next(self._arrival_seq), (name, burst_time, pages_needed, affinity, player)))
+
+    def restore_processes(self, placements):
+        # Re-queues checkpointed (pcb, cpu_id) pairs whose memory was restored separately (checkpoint.py)
+        with self._lock:
+            queued = [[] for _ in self.cpus]
+            for pcb, cpu_id in placements:
+                queued[cpu_id].append(pcb)
+            for cpu, pcbs in zip(self.cpus, queued):
+                cpu.run_queue.extend(pcbs)
+            pool = None if self.simulated else self.worker_pool
+            for pcb, _ in placements:
+                self.thread_managers[pcb.pid] = GameThreadManager(pcb, self.log_callback, self.rng, pool)
+            if placements:
+                self.next_pid = max(self.next_pid, max(pcb.pid for pcb, _ in placements) + 1)
+            self._idle.notify_all()
+            self._wake_async_workers(wake_all=True)
 
     def clear_queue(self):
-        for pcb in self.ready_queue[:]:  # Copy to avoid modifying list during iteration
-            self.thread_managers[pcb.pid].stop_threads()
-            self.file_system.delete_file(f"{pcb.name.lower()}.txt")
-            self.memory_manager.deallocate_memory(pcb)
-            del self.thread_managers[pcb.pid]
-        self.ready_queue.clear()
+        with self._lock:
+            for pcb in self.ready_queue:  # Iterates over a snapshot of the queue
+                self.thread_managers[pcb.pid].stop_threads()
+                self.file_system.delete_file(f"{pcb.name.lower()}.txt")
+                self.memory_manager.deallocate_memory(pcb)
+                del self.thread_managers[pcb.pid]
+            for cpu in self.cpus:
+                cpu.run_queue.clear()
         self.log("Queue cleared")
 
     def remove_last_process(self):
-        if not self.ready_queue:
-            return False
-        pcb = max(self.ready_queue, key=lambda x: x.pid)  # Highest PID is last added
-        self.ready_queue.remove(pcb)
+        with self._lock:
+            last = [cpu.run_queue.peek_last() for cpu in self.cpus]
+            last = [pcb for pcb in last if pcb is not None]
+            if not last:
+                return False
+            pcb = max(last, key=lambda x: x.pid)  # Highest PID is last added
+            self._remove_queued(pcb.pid)
+            self._discard_process(pcb)
+        self.log(f"Removed last process: {pcb.name}")
+        return True
+
+    def remove_process_by_name(self, name):
+        with self._lock:
+            for cpu in self.cpus:
+                pcb = cpu.run_queue.remove_by_name(name)
+                if pcb is not None:
+                    break
+            else:
+                return False
+            self._discard_process(pcb)
+        self.log(f"Removed process: {pcb.name}")
+        return True
+
+    def remove_process_by_pid(self, pid):
+        with self._lock:
+            pcb = self._remove_queued(pid)
+            if pcb is None:
+                return False
+            self._discard_process(pcb)
+        self.log(f"Removed process: {pcb.name}")
+        return True
+
+    def _remove_queued(self, pid):
+        for cpu in self.cpus:
+            pcb = cpu.run_queue.remove_by_pid(pid)
+            if pcb is not None:
+                return pcb
+        return None
+
+    def _discard_process(self, pcb):
         self.thread_managers[pcb.pid].stop_threads()
         self.file_system.delete_file(f"{pcb.name.lower()}.txt")
         self.memory_manager.deallocate_memory(pcb)
         del self.thread_managers[pcb.pid]
-        self.log(f"Removed last process: {pcb.name}")
-        return True
 
-    def remove_process_by_name(self, name):
-        for pcb in self.ready_queue:
-            if pcb.name == name:
-                self.ready_queue.remove(pcb)
-                self.thread_managers[pcb.pid].stop_threads()
-                self.file_system.delete_file(f"{pcb.name.lower()}.txt")
-                self.memory_manager.deallocate_memory(pcb)
-                del self.thread_managers[pcb.pid]
-                self.log(f"Removed process: {pcb.name}")
-                return True
-        return False
+    def queue_summary(self):
+        queued = list(self.ready_queue)
+        if not queued:
+            return "Ready Queue: Empty"
+        return "Ready Queue: [" + "|".join(f" {pcb.name} " for pcb in queued) + "]"
 
     def show_queue(self):
-        if not self.ready_queue:
-            self.log("Ready Queue: Empty")
-            return
-        queue_str = "Ready Queue: ["
-        for pcb in self.ready_queue:
-            queue_str += f" {pcb.name} "
-            if pcb == self.ready_queue[-1]:
-                queue_str += "]"
-            else:
-                queue_str += "|"
-        self.log(queue_str)
+        self.log(self.queue_summary())
 
-    def run(self):
-        while self.ready_queue:
-            pcb = min(self.ready_queue, key=lambda x: x.total_runtime)
-            self.ready_queue.remove(pcb)
-            pcb.state = "running"
-            self.log(f"\nRunning: {pcb}")
-            _, msg = self.memory_manager.translate_address(pcb.pid, 1500)
-            self.log(f"Address Translation: {msg}")
-            self.thread_managers[pcb.pid].start_threads()
-            time.sleep(self.time_quantum)
-            self.thread_managers[pcb.pid].stop_threads()
-            pcb.burst_time -= self.time_quantum
-            pcb.total_runtime += self.time_quantum
+    def _place(self, pcb):
+        # Least-loaded allowed core. The scan starts after the previous placement and stops
+        # at the first idle core, so spreading processes over many idle cores stays cheap.
+        best = None
+        for i in range(len(self.cpus)):
+            cpu = self.cpus[(self._place_cursor + i) % len(self.cpus)]
+            if self._allowed(pcb, cpu) and (best is None or cpu.load() < best.load()):
+                best = cpu
+                if best.load() == 0:
+                    break
+        if best is None:
+            best = min(self.cpus, key=CPU.load)  # Affinity names no existing core
+        self._place_cursor = (best.cpu_id + 1) % len(self.cpus)
+        return best
+
+    def _allowed(self, pcb, cpu):
+        return pcb.affinity is None or cpu.cpu_id in pcb.affinity
+
+    def _next_process(self, cpu):
+        if cpu.run_queue:
+            return cpu.run_queue.pop()
+        # Work stealing: take the policy's pick from the busiest core that this core may run
+        for victim in sorted(self.ready_queue.busy_cpus(), key=lambda c: len(c.run_queue), reverse=True):
+            if victim is cpu or not victim.run_queue:
+                continue
+            # Peek first: popping and re-queueing a process this core may not run would move it
+            # to the back of its queue (or advance CFS's min_vruntime) on the victim
+            if self._allowed(victim.run_queue.peek(), cpu):
+                cpu.steals += 1
+                tracer.count("scheduler.steals")
+                return victim.run_queue.pop()
+        return None
+
+    def _start_slice(self, cpu, pcb):
+        start = time.perf_counter() if tracer.enabled else None
+        cpu.current = pcb
+        cpu.dispatches += 1
+        if self.touched is not None:
+            self.touched.add(pcb.pid)
+        pcb.state = "running"
+        if pcb.first_run_time is None:
+            pcb.first_run_time = self.clock.now()
+        prefix = f"[CPU {cpu.cpu_id}] " if len(self.cpus) > 1 else ""
+        self.log(f"\n{prefix}Running: {pcb}")
+        self.memory_manager.context_switch(pcb.pid)
+        _, msg = self.memory_manager.translate_address(pcb.pid, 1500)
+        self.log(f"Address Translation: {msg}")
+        time_slice = cpu.run_queue.policy.time_slice(pcb, self.time_quantum)
+        if start is not None:
+            tracer.span_end("scheduler.dispatch", start, pid=pcb.pid, cpu=cpu.cpu_id)
+            tracer.count("scheduler.dispatches")
+        return time_slice
+
+    def _finish_slice(self, cpu, pcb, time_slice):
+        policy = cpu.run_queue.policy
+        cpu.current = None
+        cpu.busy_time += time_slice
+        if self.touched is not None:
+            self.touched.add(pcb.pid)  # Also covers the score its game earned during the slice
+        pcb.burst_time -= time_slice
+        pcb.total_runtime += time_slice
+        policy.on_slice_end(pcb, time_slice, time_slice)
+        with pcb.score_lock:
+            self.file_system.write_file(f"{pcb.name.lower()}.txt", f"Score: {pcb.score}")
+        if pcb.burst_time > 0:
+            pcb.state = "ready"
+            cpu.run_queue.append(pcb)
+            self.log(f"{pcb.name} moved back to ready queue")
+        else:
+            pcb.state = "terminated"
+            pcb.completion_time = self.clock.now()
+            self._record_completion(cpu, pcb)
+            tracer.count("scheduler.completed")
+            self.dropped_inputs += pcb.input_queue.dropped
+            policy.discard(pcb)
+            self.log(f"{pcb.name} terminated")
             with pcb.score_lock:
-                self.file_system.write_file(f"{pcb.name.lower()}.txt", f"Score: {pcb.score}")
-            if pcb.burst_time > 0:
-                pcb.state = "ready"
-                self.ready_queue.append(pcb)
-                self.log(f"{pcb.name} moved back to ready queue")
+                self.file_system.save_high_score(pcb.name, pcb.score, pcb.player)
+            self.memory_manager.deallocate_memory(pcb)
+            del self.thread_managers[pcb.pid]
+            self.file_system.delete_file(f"{pcb.name.lower()}.txt")
+        if not self.simulated:  # Rendering the whole queue every slice would make long simulations O(n^2)
+            self.show_queue()
+
+    def run(self):
+        self._run_started = self.clock.now()
+        if self.simulated:
+            self._run_simulated()
+        elif len(self.cpus) == 1:
+            self._cpu_worker(self.cpus[0])
+        else:
+            workers = [threading.Thread(target=self._cpu_worker, args=(cpu,), daemon=True) for cpu in self.cpus]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        self._run_elapsed += self.clock.now() - self._run_started
+        self._run_started = None
+        self.show_metrics()
+
+    def _cpu_worker(self, cpu):
+        while True:
+            with self._idle:
+                pcb = self._next_process(cpu)
+                while pcb is None:
+                    if self._running == 0 and not self.ready_queue:
+                        self._idle.notify_all()
+                        return
+                    # Another core still holds work that may come back to a run queue
+                    self._idle.wait(timeout=self.time_quantum)
+                    pcb = self._next_process(cpu)
+                self._running += 1
+                time_slice = self._start_slice(cpu, pcb)
+                manager = self.thread_managers[pcb.pid]
+            manager.start_threads()
+            self.clock.sleep(time_slice)
+            manager.stop_threads()
+            latency = manager.dispatch_latency()
+            if latency is not None:
+                self.dispatch_latencies.append(latency)
+                tracer.observe("scheduler.dispatch_latency_us", latency * 1e6)
+            with self._idle:
+                self._finish_slice(cpu, pcb, time_slice)
+                self._running -= 1
+                self._idle.notify_all()
+
+    async def run_async(self):
+        # asyncio engine: one dispatcher task per core and coroutine producer/consumers, so a
+        # core costs a few tasks instead of OS threads. The lock is never held across an await.
+        # asyncio is imported here because it dominates startup time for everything else.
+        import asyncio
+        self._async_loop = asyncio.get_running_loop()
+        self._async_waiters = deque()
+        self._run_started = self.clock.now()
+        sessions = {}
+        try:
+            await asyncio.gather(*(self._async_cpu_worker(cpu, sessions) for cpu in self.cpus))
+        finally:
+            self._run_elapsed += self.clock.now() - self._run_started
+            self._run_started = None
+            self._async_loop = self._async_waiters = None
+        self.show_metrics()
+
+    def has_work(self):
+        # True while anything is queued or a core is still running a slice
+        with self._lock:
+            return self._running > 0 or bool(self.ready_queue)
+
+    def _wake_async_workers(self, wake_all=False):
+        # Safe from any thread: idle async cores are parked on futures of the engine's loop
+        if self._async_loop is not None:
+            self._async_loop.call_soon_threadsafe(self._release_async_workers, wake_all)
+
+    def _release_async_workers(self, wake_all):
+        while self._async_waiters:
+            waiter = self._async_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                if not wake_all:
+                    return
+
+    async def _async_cpu_worker(self, cpu, sessions):
+        from async_engine import AsyncGameSession
+        while True:
+            with self._lock:
+                pcb = self._next_process(cpu)
+                if pcb is None:
+                    if self._running == 0 and not self.ready_queue:
+                        self._release_async_workers(wake_all=True)
+                        return
+                    # Park until another core requeues work or a process is added
+                    waiter = self._async_loop.create_future()
+                    self._async_waiters.append(waiter)
+                else:
+                    self._running += 1
+                    time_slice = self._start_slice(cpu, pcb)
+                    session = sessions.get(pcb.pid)
+                    if session is None:
+                        session = sessions[pcb.pid] = AsyncGameSession(self.thread_managers[pcb.pid])
+            if pcb is None:
+                await waiter
+                continue
+            await session.run_slice(time_slice)
+            latency = session.dispatch_latency()
+            if latency is not None:
+                self.dispatch_latencies.append(latency)
+                tracer.observe("scheduler.dispatch_latency_us", latency * 1e6)
+            with self._lock:
+                self._finish_slice(cpu, pcb, time_slice)
+                self._running -= 1
+                if pcb.state == "terminated":
+                    del sessions[pcb.pid]
+                    if self._running == 0:
+                        self._release_async_workers(wake_all=True)  # Let idle cores see the run is over
+                elif len(cpu.run_queue) > 1:
+                    self._release_async_workers(wake_all=False)  # Surplus work an idle core can steal
+
+    def _run_simulated(self):
+        # Discrete-event loop: each core dispatches at its own virtual time and the slice
+        # ends as a separate event, so a requeued process cannot be picked up by another
+        # core before its current slice has finished.
+        now = self.clock.now()
+        events = [(now, 0, cpu.cpu_id, None, 0) for cpu in self.cpus]
+        heapq.heapify(events)
+        seq = itertools.count(1)
+        idle = set()
+        while events or self._arrivals:
+            if self._arrivals and (not events or self._arrivals[0][0] <= events[0][0]):
+                timestamp, _, args = heapq.heappop(self._arrivals)
+                self.clock.advance_to(timestamp)
+                self.add_process(*args)
+                for waiting_id in sorted(idle):
+                    heapq.heappush(events, (self.clock.now(), next(seq), waiting_id, None, 0))
+                idle.clear()
+                continue
+            timestamp, _, cpu_id, pcb, time_slice = heapq.heappop(events)
+            self.clock.advance_to(timestamp)
+            cpu = self.cpus[cpu_id]
+            if pcb is None:
+                pcb = self._next_process(cpu)
+                if pcb is None:
+                    idle.add(cpu_id)
+                    continue
+                time_slice = self._start_slice(cpu, pcb)
+                self.thread_managers[pcb.pid].simulate_slice(time_slice)
+                heapq.heappush(events, (timestamp + time_slice, next(seq), cpu_id, pcb, time_slice))
             else:
-                pcb.state = "terminated"
-                self.log(f"{pcb.name} terminated")
-                with pcb.score_lock:
-                    self.file_system.save_high_score(pcb.name, pcb.score)
-                self.memory_manager.deallocate_memory(pcb)
-                del self.thread_managers[pcb.pid]
-                self.file_system.delete_file(f"{pcb.name.lower()}.txt")
-            self.show_queue()
\ No newline at end of file
+                self._finish_slice(cpu, pcb, time_slice)
+                # Wake idle cores too, they may be able to steal the requeued process
+                for waiting_id in sorted(idle | {cpu_id}):
+                    heapq.heappush(events, (timestamp, next(seq), waiting_id, None, 0))
+                idle.clear()
@@ -0,0 +1,331 @@
+import copy
+import heapq
+import itertools
+import random
+from collections import deque
+
+class SchedulingPolicy:
+    # Common interface for ready-queue ordering. ReadyQueue owns the pid/name indexes and
+    # calls push/pop/discard; the Scheduler asks for the slice length and reports how long
+    # the process actually ran so policies can update their own per-process state.
+    name = None
+
+    def push(self, pcb):
+        raise NotImplementedError
+
+    def push_many(self, pcbs):
+        # Same as pushing each in turn; policies override it when a batch is cheaper
+        for pcb in pcbs:
+            self.push(pcb)
+
+    def pop(self):
+        raise NotImplementedError
+
+    def peek(self):
+        # The process pop() would return next, without changing any ordering state
+        raise NotImplementedError
+
+    def discard(self, pcb):
+        # Drop pcb from the queue (if queued) and forget any per-process state
+        raise NotImplementedError
+
+    def time_slice(self, pcb, time_quantum):
+        return time_quantum
+
+    def on_slice_end(self, pcb, ran, time_slice):
+        pass
+
+class HeapPolicy(SchedulingPolicy):
+    # Min-heap on key(pcb) with lazy-deletion tombstones: _live maps pid to the sequence
+    # number of its only valid entry, so discard is O(1) and pop skips stale entries.
+    def __init__(self):
+        self._heap = []
+        self._live = {}
+        self._seq = itertools.count()
+
+    def key(self, pcb):
+        raise NotImplementedError
+
+    def push(self, pcb):
+        seq = next(self._seq)
+        self._live[pcb.pid] = seq
+        heapq.heappush(self._heap, (self.key(pcb), seq, pcb))
+
+    def push_many(self, pcbs):
+        # One heapify for the batch instead of a sift per process
+        for pcb in pcbs:
+            seq = next(self._seq)
+            self._live[pcb.pid] = seq
+            self._heap.append((self.key(pcb), seq, pcb))
+        heapq.heapify(self._heap)
+
+    def pop(self):
+        while self._heap:
+            _, seq, pcb = heapq.heappop(self._heap)
+            if self._live.get(pcb.pid) == seq:
+                del self._live[pcb.pid]
+                return pcb
+        raise IndexError("pop from empty ready queue")
+
+    def peek(self):
+        while self._heap:
+            _, seq, pcb = self._heap[0]
+            if self._live.get(pcb.pid) == seq:
+                return pcb
+            heapq.heappop(self._heap)
+        raise IndexError("peek from empty ready queue")
+
+    def discard(self, pcb):
+        self._live.pop(pcb.pid, None)
+        # Rebuild once tombstones outnumber live entries so the heap stays O(n)
+        if len(self._heap) > 2 * len(self._live) + 16:
+            self._heap = [entry for entry in self._heap if self._live.get(entry[2].pid) == entry[1]]
+            heapq.heapify(self._heap)
+
+class LeastRuntimePolicy(HeapPolicy):
+    # The original AI scheduler: favour the least-played game
+    name = "least-runtime"
+
+    def key(self, pcb):
+        return (pcb.total_runtime, pcb.pid)
+
+class SRTFPolicy(HeapPolicy):
+    # Shortest remaining time first; preemption happens at every quantum boundary
+    name = "srtf"
+
+    def key(self, pcb):
+        return (pcb.burst_time, pcb.pid)
+
+class CFSPolicy(HeapPolicy):
+    # Completely-fair-style scheduling on virtual runtime. Heavier weights age more slowly;
+    # newcomers start at min_vruntime so they cannot starve processes already queued.
+    name = "cfs"
+    NICE_0_WEIGHT = 1024
+
+    def __init__(self, weights=None):
+        super().__init__()
+        self.weights = weights or {}  # Game name -> weight
+        self.vruntime = {}
+        self.min_vruntime = 0
+
+    def key(self, pcb):
+        return (self.vruntime[pcb.pid], pcb.pid)
+
+    def push(self, pcb):
+        self.vruntime.setdefault(pcb.pid, self.min_vruntime)
+        super().push(pcb)
+
+    def push_many(self, pcbs):
+        for pcb in pcbs:
+            self.vruntime.setdefault(pcb.pid, self.min_vruntime)
+        super().push_many(pcbs)
+
+    def pop(self):
+        pcb = super().pop()
+        self.min_vruntime = max(self.min_vruntime, self.vruntime[pcb.pid])
+        return pcb
+
+    def discard(self, pcb):
+        super().discard(pcb)
+        self.vruntime.pop(pcb.pid, None)
+
+    def on_slice_end(self, pcb, ran, time_slice):
+        weight = self.weights.get(pcb.name, self.NICE_0_WEIGHT)
+        vruntime = self.vruntime.get(pcb.pid, self.min_vruntime)  # Unknown if the policy was swapped mid-slice
+        self.vruntime[pcb.pid] = vruntime + ran * self.NICE_0_WEIGHT / weight
+
+class MLFQPolicy(SchedulingPolicy):
+    # Multilevel feedback queue: FIFO per level, level k gets time_quantum * 2**k.
+    # A process that uses its whole slice is demoted; every boost_interval slices all
+    # processes return to the top level so long games cannot be starved forever.
+    #
+    # Boosts are O(1): level_of holds (level, epoch) and a level from an older epoch counts
+    # as 0. Each level's deque is in arrival order, so everything queued before the last
+    # boost is a prefix of every deque; pop serves those prefixes first, oldest first.
+    name = "mlfq"
+
+    def __init__(self, levels=3, boost_interval=20):
+        self.queues = [deque() for _ in range(levels)]
+        self.level_of = {}  # pid -> (level, epoch)
+        self.boost_interval = boost_interval
+        self._live = {}
+        self._seq = itertools.count()
+        self._slices = 0
+        self._epoch = 0
+        self._boost_seq = 0  # Entries with a lower seq were queued before the last boost
+
+    def _level(self, pid):
+        level, epoch = self.level_of.get(pid, (0, self._epoch))
+        return level if epoch == self._epoch else 0
+
+    def push(self, pcb):
+        level = self._level(pcb.pid)
+        self.level_of[pcb.pid] = (level, self._epoch)
+        seq = next(self._seq)
+        self._live[pcb.pid] = seq
+        self.queues[level].append((seq, pcb))
+
+    def _next_queue(self):
+        # The deque whose head runs next, with stale heads dropped, or None if all are empty
+        boosted = None
+        for level_queue in self.queues:
+            while level_queue and self._live.get(level_queue[0][1].pid) != level_queue[0][0]:
+                level_queue.popleft()  # Stale entry
+            if level_queue and level_queue[0][0] < self._boost_seq and (boosted is None or level_queue[0][0] < boosted[0][0]):
+                boosted = level_queue
+        if boosted is not None:
+            return boosted
+        return next((level_queue for level_queue in self.queues if level_queue), None)
+
+    def pop(self):
+        level_queue = self._next_queue()
+        if level_queue is None:
+            raise IndexError("pop from empty ready queue")
+        seq, pcb = level_queue.popleft()
+        del self._live[pcb.pid]
+        return pcb
+
+    def peek(self):
+        level_queue = self._next_queue()
+        if level_queue is None:
+            raise IndexError("peek from empty ready queue")
+        return level_queue[0][1]
+
+    def discard(self, pcb):
+        self._live.pop(pcb.pid, None)
+        self.level_of.pop(pcb.pid, None)
+        if sum(len(q) for q in self.queues) > 2 * len(self._live) + 16:
+            for level, level_queue in enumerate(self.queues):
+                self.queues[level] = deque(e for e in level_queue if self._live.get(e[1].pid) == e[0])
+
+    def time_slice(self, pcb, time_quantum):
+        return time_quantum * (2 ** self._level(pcb.pid))
+
+    def on_slice_end(self, pcb, ran, time_slice):
+        level = self._level(pcb.pid)
+        if ran >= time_slice and level < len(self.queues) - 1:
+            level += 1
+        self.level_of[pcb.pid] = (level, self._epoch)
+        self._slices += 1
+        if self.boost_interval and self._slices % self.boost_interval == 0:
+            self._boost()
+
+    def _boost(self):
+        self._epoch += 1
+        self._boost_seq = next(self._seq)
+
+class LotteryPolicy(SchedulingPolicy):
+    # Lottery scheduling over a Fenwick tree of ticket counts, so a draw is O(log n).
+    # Each queued process owns a slot; freed slots are reused before the tree grows.
+    name = "lottery"
+    DEFAULT_TICKETS = 100
+
+    def __init__(self, tickets=None, rng=None):
+        self.tickets = tickets or {}  # Game name -> ticket count
+        self.rng = rng or random.Random()
+        self._tree = [0] * 17  # 1-based Fenwick tree over 16 slots
+        self._slots = [None] * 16
+        self._slot_of = {}
+        self._free_slots = list(range(15, -1, -1))
+
+    def _update(self, slot, delta):
+        i = slot + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _total(self):
+        total, i = 0, len(self._slots)
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _grow(self):
+        old = len(self._slots)
+        self._slots.extend([None] * old)
+        self._free_slots = list(range(2 * old - 1, old - 1, -1))
+        self._tree = [0] * (2 * old + 1)
+        for slot, pcb in enumerate(self._slots):
+            if pcb is not None:
+                self._update(slot, self._tickets_for(pcb))
+
+    def _tickets_for(self, pcb):
+        return max(1, self.tickets.get(pcb.name, self.DEFAULT_TICKETS))
+
+    def push(self, pcb):
+        if not self._free_slots:
+            self._grow()
+        slot = self._free_slots.pop()
+        self._slots[slot] = pcb
+        self._slot_of[pcb.pid] = slot
+        self._update(slot, self._tickets_for(pcb))
+
+    def _release(self, slot):
+        pcb = self._slots[slot]
+        self._update(slot, -self._tickets_for(pcb))
+        self._slots[slot] = None
+        del self._slot_of[pcb.pid]
+        self._free_slots.append(slot)
+        return pcb
+
+    def _draw(self):
+        # Slot holding the winning ticket, or None if nothing is queued
+        total = self._total()
+        if not total:
+            return None
+        # Binary-lift down the Fenwick tree to the slot holding the winning ticket
+        winner = self.rng.randrange(total)
+        index, step = 0, 1 << (len(self._slots).bit_length() - 1)
+        while step:
+            nxt = index + step
+            if nxt < len(self._tree) and self._tree[nxt] <= winner:
+                index = nxt
+                winner -= self._tree[nxt]
+            step >>= 1
+        return index
+
+    def pop(self):
+        slot = self._draw()
+        if slot is None:
+            raise IndexError("pop from empty ready queue")
+        return self._release(slot)
+
+    def peek(self):
+        # Draws with the generator's state put back, so the next pop() makes the same draw
+        state = self.rng.getstate()
+        slot = self._draw()
+        self.rng.setstate(state)
+        if slot is None:
+            raise IndexError("peek from empty ready queue")
+        return self._slots[slot]
+
+    def discard(self, pcb):
+        slot = self._slot_of.get(pcb.pid)
+        if slot is not None:
+            self._release(slot)
+
+POLICIES = {
+    LeastRuntimePolicy.name: LeastRuntimePolicy,
+    SRTFPolicy.name: SRTFPolicy,
+    MLFQPolicy.name: MLFQPolicy,
+    LotteryPolicy.name: LotteryPolicy,
+    CFSPolicy.name: CFSPolicy,
+}
+
+def make_policy(policy=None, rng=None):
+    if isinstance(policy, SchedulingPolicy):
+        return policy
+    name = policy or LeastRuntimePolicy.name
+    if name not in POLICIES:
+        raise ValueError(f"Unknown scheduling policy '{name}'. Choose from: {', '.join(POLICIES)}")
+    if name == LotteryPolicy.name:
+        return LotteryPolicy(rng=rng)
+    return POLICIES[name]()
+
+def make_policies(policy, count, rng=None):
+    # One policy per core: each ReadyQueue keeps its entries inside its policy, so cores
+    # cannot share one. A configured instance runs on the first core and the others get copies.
+    if isinstance(policy, SchedulingPolicy):
+        return [policy] + [copy.deepcopy(policy) for _ in range(count - 1)]
+    return [make_policy(policy, rng) for _ in range(count)]
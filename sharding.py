@@ -0,0 +1,290 @@
+# Sharded mode: several scheduler worker processes, each owning a partition of the
+# processes and page frames, behind a coordinator in the calling process. Every shard has
+# its own interpreter (so no shared GIL), Scheduler, MemoryManager and FileSystem under
+# games_dir/shard-N, and talks to the coordinator over a multiprocessing Pipe.
+#
+#   sharded = ShardedScheduler(shards=4, total_pages=4096, simulated=True, seed=1)
+#   sharded.add_process("Snake", 6, 4)
+#   sharded.run()               # rebalances, then every shard runs in parallel
+#   print(sharded.metrics(), sharded.high_scores())
+#   sharded.close()
+
+import os
+
+from file_system import FileSystem
+from instrumentation import tracer
+from memory_management import MemoryManager
+from process_management import PCB, Scheduler
+
+PID_RANGE = 10 ** 9  # Shard n hands out pids from n * PID_RANGE + 1, so a pid names its home shard
+
+def _spec(name, burst_time=6, pages_needed=4, affinity=None, player="Player"):
+    return name, burst_time, pages_needed, affinity, player
+
+def _pack(pcb, now):
+    # Plain tuple for the pipe: live PCBs hold locks and channels that cannot be pickled
+    return (pcb.pid, pcb.name, pcb.burst_time, pcb.pages_needed, pcb.player, pcb.total_runtime, pcb.score,
+            sorted(pcb.affinity) if pcb.affinity is not None else None,
+            now - pcb.arrival_time, now - pcb.first_run_time if pcb.first_run_time is not None else None)
+
+def _unpack(packed, now, scheduler):
+    pid, name, burst_time, pages_needed, player, total_runtime, score, affinity, waited, since_first_run = packed
+    pcb = PCB(pid, name, burst_time, pages_needed, player, scheduler.input_capacity, scheduler.backpressure)
+    pcb.total_runtime = total_runtime
+    pcb.score = score
+    pcb.affinity = set(affinity) if affinity is not None else None
+    pcb.arrival_time = now - waited
+    pcb.first_run_time = now - since_first_run if since_first_run is not None else None
+    return pcb
+
+class _Shard:
+    # Runs inside a worker process; each do_* method answers one coordinator command
+    def __init__(self, shard_id, config):
+        tracer.verbose = False
+        os.makedirs(config["games_dir"], exist_ok=True)
+        self.memory_manager = MemoryManager(total_pages=config["pages"], page_size=config["page_size"],
+                                            allocator=config["allocator"])
+        self.file_system = FileSystem(games_dir=os.path.join(config["games_dir"], f"shard-{shard_id}"), write_back=True)
+        seed = config["seed"] + shard_id if config["seed"] is not None else None
+        self.scheduler = Scheduler(config["time_quantum"], self.memory_manager, self.file_system,
+                                   log_callback=lambda message: None, simulated=config["simulated"], seed=seed,
+                                   policy=config["policy"], cpus=config["cpus"])
+        self.scheduler.next_pid = shard_id * PID_RANGE + 1
+
+    def status(self):
+        return len(self.scheduler.ready_queue), self.memory_manager.total_pages - self.memory_manager.used_pages
+
+    def do_add(self, specs):
+        pids = []
+        for name, burst_time, pages_needed, affinity, player in specs:
+            pcb = self.scheduler.add_process(name, burst_time, pages_needed, affinity, player)
+            pids.append(pcb.pid if pcb is not None else None)
+        return pids
+
+    def do_remove_name(self, name):
+        return self.scheduler.remove_process_by_name(name)
+
+    def do_remove_pid(self, pid):
+        return self.scheduler.remove_process_by_pid(pid)
+
+    def do_take(self, count):
+        now = self.scheduler.clock.now()
+        return [_pack(pcb, now) for pcb in self.scheduler.take_processes(count)]
+
+    def do_adopt(self, packed):
+        # Returns the processes that did not fit in this shard's memory
+        now = self.scheduler.clock.now()
+        return [item for item in packed if self.scheduler.adopt_process(_unpack(item, now, self.scheduler)) is None]
+
+    def do_run(self):
+        self.scheduler.run()
+        self.file_system.sync()
+
+    def do_status(self):
+        return None
+
+    def do_stats(self):
+        scheduler = self.scheduler
+        return {
+            "completed": scheduler.completed,
+            "cpus": scheduler.cpu_utilization(),
+            "failed_allocations": scheduler.failed_allocations,
+            "used_pages": self.memory_manager.used_pages,
+            "total_pages": self.memory_manager.total_pages,
+            "file_ops": dict(self.file_system.op_counts),
+        }
+
+    def do_scores(self, games, k):
+        leaderboard = self.file_system.leaderboard
+        return dict(self.file_system.high_scores), {game: leaderboard.top_scores(game, k) for game in games}
+
+    def close(self):
+        self.file_system.close()
+
+def _shard_main(conn, shard_id, config):
+    shard = _Shard(shard_id, config)
+    try:
+        while True:
+            command, args = conn.recv()
+            if command == "stop":
+                break
+            try:
+                result = getattr(shard, "do_" + command)(*args)
+                conn.send((True, result, shard.status()))
+            except Exception as e:
+                conn.send((False, e, shard.status()))
+    finally:
+        shard.close()
+        conn.close()
+
+class ShardedScheduler:
+    # Coordinator: routes add/remove to shards, migrates queued processes from the most to
+    # the least loaded shards before each run, and aggregates metrics and high scores.
+    # Page frames are split evenly, so a process must fit in one shard's share of memory.
+    def __init__(self, shards=None, time_quantum=2, total_pages=64, page_size=1024, games_dir="games", policy=None,
+                 cpus_per_shard=1, simulated=False, seed=None, allocator="bitmap"):
+        import multiprocessing  # Only sharded runs pay for it
+        shards = shards or os.cpu_count() or 1
+        if total_pages < shards:
+            raise ValueError(f"{total_pages} pages cannot be split across {shards} shards")
+        # Spawn rather than fork: the caller may already be running threads (GUI, flushers)
+        context = multiprocessing.get_context("spawn")
+        self.connections = []
+        self.workers = []
+        for shard_id in range(shards):
+            config = {
+                "pages": total_pages // shards + (1 if shard_id < total_pages % shards else 0),
+                "page_size": page_size,
+                "allocator": allocator,
+                "games_dir": games_dir,
+                "seed": seed,
+                "time_quantum": time_quantum,
+                "simulated": simulated,
+                "policy": policy,
+                "cpus": cpus_per_shard,
+            }
+            parent, child = context.Pipe()
+            worker = context.Process(target=_shard_main, args=(child, shard_id, config), daemon=True)
+            worker.start()
+            child.close()
+            self.connections.append(parent)
+            self.workers.append(worker)
+        self.loads = [0] * shards  # Queued processes per shard, as of its last reply
+        self.free_pages = [0] * shards
+        self.migrations = 0
+        self.locations = {}  # pid -> shard, for processes migrated away from their home shard
+        self._broadcast("status")
+
+    @property
+    def shards(self):
+        return len(self.connections)
+
+    def _receive(self, shard_id):
+        ok, result, (self.loads[shard_id], self.free_pages[shard_id]) = self.connections[shard_id].recv()
+        if not ok:
+            raise result
+        return result
+
+    def _call(self, shard_id, command, *args):
+        self.connections[shard_id].send((command, args))
+        return self._receive(shard_id)
+
+    def _broadcast(self, command, *args):
+        # Sends to every shard before waiting on any, so they work in parallel
+        for connection in self.connections:
+            connection.send((command, args))
+        return [self._receive(shard_id) for shard_id in range(self.shards)]
+
+    def _route(self, pages_needed):
+        # Least-loaded shard with room for the process; the least loaded overall if none has
+        fits = [shard_id for shard_id in range(self.shards) if self.free_pages[shard_id] >= pages_needed]
+        return min(fits or range(self.shards), key=lambda shard_id: self.loads[shard_id])
+
+    def add_process(self, name, burst_time=6, pages_needed=4, affinity=None, player="Player"):
+        # Returns the new process's pid, or None if its shard had no memory for it
+        return self._call(self._route(pages_needed), "add", [(name, burst_time, pages_needed, affinity, player)])[0]
+
+    def add_processes(self, specs):
+        # Bulk add of (name, burst_time, pages_needed[, affinity[, player]]) tuples with one
+        # message per shard. Returns pids in input order, None where memory was full.
+        batches = [[] for _ in range(self.shards)]
+        for index, spec in enumerate(specs):
+            spec = _spec(*spec)
+            shard_id = self._route(spec[2])
+            batches[shard_id].append((index, spec))
+            self.loads[shard_id] += 1
+            self.free_pages[shard_id] -= spec[2]
+        for shard_id, batch in enumerate(batches):
+            self.connections[shard_id].send(("add", ([spec for _, spec in batch],)))
+        pids = [None] * len(specs)
+        for shard_id, batch in enumerate(batches):
+            for (index, _), pid in zip(batch, self._receive(shard_id)):
+                pids[index] = pid
+        return pids
+
+    def remove_process_by_name(self, name):
+        for shard_id in range(self.shards):
+            if self._call(shard_id, "remove_name", name):
+                return True
+        return False
+
+    def remove_process_by_pid(self, pid):
+        shard_id = self.locations.get(pid, pid // PID_RANGE)
+        if not (0 <= shard_id < self.shards and self._call(shard_id, "remove_pid", pid)):
+            return False
+        self.locations.pop(pid, None)
+        return True
+
+    def rebalance(self):
+        # Moves queued processes from the busiest to the idlest shards until queue lengths
+        # differ by at most one (or memory stops the move). Returns how many were migrated.
+        self._broadcast("status")
+        moved = 0
+        while True:
+            source = max(range(self.shards), key=lambda shard_id: self.loads[shard_id])
+            target = min(range(self.shards), key=lambda shard_id: self.loads[shard_id])
+            count = (self.loads[source] - self.loads[target]) // 2
+            if count <= 0:
+                break
+            packed = self._call(source, "take", count)
+            rejected = self._call(target, "adopt", packed)
+            if rejected:
+                self._call(source, "adopt", rejected)  # Back where they came from
+            rejected_pids = {item[0] for item in rejected}
+            for item in packed:
+                pid = item[0]
+                if pid not in rejected_pids:
+                    if target == pid // PID_RANGE:
+                        self.locations.pop(pid, None)
+                    else:
+                        self.locations[pid] = target
+            moved += len(packed) - len(rejected)
+            if len(rejected) == len(packed):
+                break
+        self.migrations += moved
+        return moved
+
+    def run(self):
+        self.rebalance()
+        self._broadcast("run")
+        self.locations.clear()  # Every process has finished
+
+    def stats(self):
+        return self._broadcast("stats")
+
+    def metrics(self):
+        # Same shape as Scheduler.metrics(), over every shard's completed processes
+        completed = {}
+        for shard in self.stats():
+            for name, records in shard["completed"].items():
+                completed.setdefault(name, []).extend(records)
+        report = {}
+        for name, records in completed.items():
+            count = len(records)
+            report[name] = {
+                "completed": count,
+                "avg_waiting": sum(r[0] for r in records) / count,
+                "avg_turnaround": sum(r[1] for r in records) / count,
+                "avg_response": sum(r[2] for r in records) / count,
+            }
+        return report
+
+    def high_scores(self):
+        merged = {}
+        for scores, _ in self._broadcast("scores", [], None):
+            for game, score in scores.items():
+                merged[game] = max(score, merged.get(game, score))
+        return merged
+
+    def top_scores(self, game, k=10):
+        entries = [entry for _, top in self._broadcast("scores", [game], k) for entry in top[game]]
+        return sorted(entries, key=lambda entry: -entry[1])[:k]
+
+    def close(self):
+        for connection in self.connections:
+            connection.send(("stop", ()))
+        for worker in self.workers:
+            worker.join()
+        for connection in self.connections:
+            connection.close()
+        self.connections, self.workers = [], []
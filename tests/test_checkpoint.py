@@ -0,0 +1,66 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from checkpoint import Checkpointer, restore
+from file_system import FileSystem
+from instrumentation import tracer
+from memory_management import MemoryManager
+from process_management import Scheduler
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        tracer.verbose = False
+        self.games_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.games_dir.cleanup)
+        self.path = os.path.join(self.games_dir.name, "console.ckpt")
+
+    def make_scheduler(self):
+        file_system = FileSystem(games_dir=self.games_dir.name)
+        self.addCleanup(file_system.close)
+        return Scheduler(1, MemoryManager(total_pages=256, demand_paging=True), file_system,
+                         log_callback=lambda message: None, simulated=True, seed=1, cpus=2)
+
+    def snapshot(self, scheduler):
+        processes = sorted((pcb.pid, pcb.name, pcb.score, tuple(pcb.pages), cpu.cpu_id)
+                           for cpu in scheduler.cpus for pcb in cpu.run_queue)
+        memory = scheduler.memory_manager
+        return processes, sorted(memory.mapped_entries()), memory.used_pages
+
+    def test_delta_holds_only_changed_processes(self):
+        scheduler = self.make_scheduler()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(50):
+                scheduler.add_process(f"Game{i}", 4, 2)
+            checkpointer = Checkpointer(scheduler, self.path)
+            full = checkpointer.checkpoint()
+            scheduler.memory_manager.translate(3, 0, write=True)
+            scheduler.remove_process_by_pid(7)
+            scheduler.add_process("Late", 4, 2)
+            delta = checkpointer.checkpoint()
+            self.assertLess(delta, full // 5)
+            restored = self.make_scheduler()
+            self.assertEqual(restore(restored, self.path), 50)
+        self.assertEqual(self.snapshot(restored), self.snapshot(scheduler))
+
+    def test_rejected_restore_changes_nothing(self):
+        scheduler = self.make_scheduler()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(4):
+                scheduler.add_process(f"Game{i}", 4, 2)
+                scheduler.memory_manager.translate(i + 1, 0)
+            Checkpointer(scheduler, self.path).checkpoint()
+        restored = self.make_scheduler()
+        restored.set_policy("cfs")
+        restored.memory_manager.frames.reserve_many([[3]])  # The last process's frame
+        with self.assertRaises(ValueError):
+            restore(restored, self.path)
+        self.assertEqual(restored.memory_manager.used_pages, 1)
+        self.assertEqual(restored.memory_manager.page_tables, {})
+        self.assertFalse(restored.ready_queue)
+        self.assertEqual(restored.policy.name, "cfs")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import threading
+import time
+import unittest
+
+from concurrency import INPUT_INTERVAL, GameThreadManager
+from process_management import PCB
+
+class ConsumerStopTest(unittest.TestCase):
+    def test_stop_wakes_a_blocked_consumer(self):
+        manager = GameThreadManager(PCB(1, "Snake", 4), log_callback=lambda message: None)
+        stop_event = threading.Event()
+        consumer = threading.Thread(target=manager.consumer, args=(stop_event,))
+        consumer.start()
+        time.sleep(0.05)  # Let it block on the empty channel
+        start = time.monotonic()
+        stop_event.set()
+        manager.pcb.input_queue.wake()
+        consumer.join(INPUT_INTERVAL)
+        self.assertFalse(consumer.is_alive())
+        self.assertLess(time.monotonic() - start, INPUT_INTERVAL / 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import random
+import unittest
+
+from leaderboard import Leaderboard, ScoreCounts
+
+class ScoreCountsTest(unittest.TestCase):
+    def test_at_most_matches_a_linear_count(self):
+        rng = random.Random(7)
+        counts, scores = ScoreCounts(), []
+        for _ in range(5 * ScoreCounts.LOAD):  # Enough for several bucket splits
+            score = rng.choice([rng.randrange(-50, 50), rng.randrange(10 ** 12)])  # Ties and huge values
+            counts.add(score)
+            scores.append(score)
+        self.assertGreater(len(counts.buckets), 2)
+        self.assertEqual(counts.total, len(scores))
+        for probe in scores[:200] + [-100, 0, 49, 10 ** 13]:
+            self.assertEqual(counts.at_most(probe), sum(score <= probe for score in scores))
+
+class LeaderboardTest(unittest.TestCase):
+    def test_rank_and_top_scores(self):
+        leaderboard = Leaderboard(top_k=3)
+        for player, score in [("ann", 30), ("bob", 10), ("cy", 30), ("dee", 20_000_000), ("eve", -5)]:
+            leaderboard.record("Snake", player, score)
+        self.assertEqual(leaderboard.top_scores("Snake"), [("dee", 20_000_000), ("ann", 30), ("cy", 30)])
+        self.assertEqual(leaderboard.rank("Snake", 20_000_001), 1)
+        self.assertEqual(leaderboard.rank("Snake", 30), 2)  # Only dee scored more
+        self.assertEqual(leaderboard.rank("Snake", 11), 4)
+        self.assertEqual(leaderboard.rank("Snake", -10), 6)
+        self.assertEqual(leaderboard.rank("Pong", 0), 1)
+        self.assertEqual(leaderboard.sessions("Snake"), 5)
+        self.assertEqual(leaderboard.pop_changed(), {"Snake"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+
+from instrumentation import tracer
+from memory_management import MemoryManager
+from process_management import PCB
+
+class NegativeAddressTest(unittest.TestCase):
+    def test_negative_address_is_rejected_and_leaves_lru_intact(self):
+        tracer.verbose = False
+        memory = MemoryManager(total_pages=2, page_size=1024, demand_paging=True, replacement="lru")
+        memory.allocate_memory(PCB(1, "Snake", 6, 4))
+        self.assertIsNone(memory.translate(1, -1))
+        self.assertEqual(memory.translate_address(1, -1), (None, "Invalid page number"))
+        # Filling memory and evicting must not find a (pid, -1) page in the LRU order
+        addresses = [memory.translate(1, address) for address in (0, 1024, 2048, 3077)]
+        self.assertNotIn(None, addresses)
+        self.assertEqual(memory.evictions, 2)
+        self.assertEqual(addresses[3] % 1024, 5)
+
+if __name__ == "__main__":
+    unittest.main()
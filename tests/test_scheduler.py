@@ -0,0 +1,161 @@
+import contextlib
+import io
+import itertools
+import random
+import tempfile
+import unittest
+from collections import deque
+
+from file_system import FileSystem
+from instrumentation import tracer
+from memory_management import MemoryManager
+from process_management import PCB, Scheduler
+from scheduling_policies import POLICIES, MLFQPolicy, SchedulingPolicy, SRTFPolicy
+
+class PolicyPerCoreTest(unittest.TestCase):
+    # A policy instance passed to a multi-core Scheduler must not be shared between the
+    # cores' ready queues, which keep their entries inside the policy
+    def setUp(self):
+        tracer.verbose = False
+        self.games_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.games_dir.cleanup)
+
+    def make_scheduler(self, policy=None):
+        file_system = FileSystem(games_dir=self.games_dir.name)
+        self.addCleanup(file_system.close)
+        return Scheduler(1, MemoryManager(total_pages=64), file_system,
+                         log_callback=lambda message: None, simulated=True, seed=1, policy=policy, cpus=2)
+
+    def run_games(self, scheduler, count=10):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(count):
+                scheduler.add_process(f"Game{i}", 2 + i % 3, 4)
+            scheduler.run()
+        return sum(len(records) for records in scheduler.completed.values())
+
+    def test_instance_gets_one_policy_per_core(self):
+        policy = SRTFPolicy()
+        scheduler = self.make_scheduler(policy)
+        policies = [cpu.run_queue.policy for cpu in scheduler.cpus]
+        self.assertIs(policies[0], policy)
+        self.assertIsNot(policies[0], policies[1])
+        self.assertIsInstance(policies[1], SRTFPolicy)
+        self.assertEqual(self.run_games(scheduler), 10)
+
+    def test_set_policy_with_instance(self):
+        scheduler = self.make_scheduler()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(6):
+                scheduler.add_process(f"Game{i}", 3, 4)
+        scheduler.set_policy(MLFQPolicy(levels=2))
+        first, second = (cpu.run_queue.policy for cpu in scheduler.cpus)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(second.queues), 2)
+        self.assertEqual(self.run_games(scheduler, count=4), 10)
+
+class WorkStealingTest(unittest.TestCase):
+    # An idle core that may not run the victim's next process must leave the victim's
+    # queue exactly as it was
+    def dispatch_order(self, policy, cpus):
+        lines = []
+        with tempfile.TemporaryDirectory() as games_dir:
+            file_system = FileSystem(games_dir=games_dir)
+            scheduler = Scheduler(2, MemoryManager(total_pages=64), file_system, log_callback=lines.append,
+                                  simulated=True, seed=1, policy=policy, cpus=cpus)
+            for name in "ABCD":
+                scheduler.add_process(name, 8, 4, affinity={0})
+            scheduler.run()
+            file_system.close()
+        return [line.split("Running: ")[1][0] for line in lines if "Running: " in line]
+
+    def test_pinned_processes_keep_their_order(self):
+        tracer.verbose = False
+        for policy in POLICIES:
+            with self.subTest(policy=policy):
+                self.assertEqual(self.dispatch_order(policy, 2), self.dispatch_order(policy, 1))
+
+class RebuildOnBoostMLFQ(SchedulingPolicy):
+    # The MLFQ from before O(1) boosts, kept as the reference: a boost re-queues every
+    # waiting process at level 0 in arrival order
+    def __init__(self, levels, boost_interval):
+        self.queues = [deque() for _ in range(levels)]
+        self.level_of = {}
+        self.boost_interval = boost_interval
+        self._live = {}
+        self._seq = itertools.count()
+        self._slices = 0
+
+    def push(self, pcb):
+        level = self.level_of.setdefault(pcb.pid, 0)
+        seq = next(self._seq)
+        self._live[pcb.pid] = seq
+        self.queues[level].append((seq, pcb))
+
+    def pop(self):
+        for level_queue in self.queues:
+            while level_queue:
+                seq, pcb = level_queue.popleft()
+                if self._live.get(pcb.pid) == seq:
+                    del self._live[pcb.pid]
+                    return pcb
+        raise IndexError("pop from empty ready queue")
+
+    def discard(self, pcb):
+        self._live.pop(pcb.pid, None)
+        self.level_of.pop(pcb.pid, None)
+
+    def time_slice(self, pcb, time_quantum):
+        return time_quantum * (2 ** self.level_of.get(pcb.pid, 0))
+
+    def on_slice_end(self, pcb, ran, time_slice):
+        level = self.level_of.get(pcb.pid, 0)
+        if ran >= time_slice and level < len(self.queues) - 1:
+            self.level_of[pcb.pid] = level + 1
+        self._slices += 1
+        if self.boost_interval and self._slices % self.boost_interval == 0:
+            waiting = sorted((e for q in self.queues for e in q if self._live.get(e[1].pid) == e[0]), key=lambda e: e[0])
+            for pid in self.level_of:
+                self.level_of[pid] = 0
+            self.queues = [deque(waiting)] + [deque() for _ in self.queues[1:]]
+
+class MLFQBoostTest(unittest.TestCase):
+    # Random push/pop/discard/slice sequences must dispatch in the same order, with the
+    # same slice lengths, as the rebuild-on-boost implementation
+    def test_matches_rebuild_on_boost(self):
+        for trial in range(200):
+            rng = random.Random(trial)
+            levels, boost_interval = rng.randint(1, 4), rng.choice([0, 1, 3, 7, 20])
+            reference, policy = RebuildOnBoostMLFQ(levels, boost_interval), MLFQPolicy(levels, boost_interval)
+            queued, pids = {}, itertools.count(1)
+            for step in range(300):
+                op = rng.random()
+                if op < 0.35 or not queued:
+                    pcb = PCB(next(pids), "Game", 6)
+                    queued[pcb.pid] = pcb
+                    reference.push(pcb)
+                    policy.push(pcb)
+                elif op < 0.8:
+                    peeked = policy.peek()
+                    pcb = reference.pop()
+                    self.assertIs(policy.pop(), pcb, (trial, step))
+                    self.assertIs(peeked, pcb, (trial, step))
+                    del queued[pcb.pid]
+                    time_slice = reference.time_slice(pcb, 2)
+                    self.assertEqual(policy.time_slice(pcb, 2), time_slice, (trial, step))
+                    ran = time_slice if rng.random() < 0.6 else 1
+                    reference.on_slice_end(pcb, ran, time_slice)
+                    policy.on_slice_end(pcb, ran, time_slice)
+                    if rng.random() < 0.7:
+                        queued[pcb.pid] = pcb
+                        reference.push(pcb)
+                        policy.push(pcb)
+                    else:
+                        reference.discard(pcb)
+                        policy.discard(pcb)
+                else:
+                    pcb = queued.pop(rng.choice(sorted(queued)))
+                    reference.discard(pcb)
+                    policy.discard(pcb)
+
+if __name__ == "__main__":
+    unittest.main()
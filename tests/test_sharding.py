@@ -0,0 +1,20 @@
+import tempfile
+import unittest
+
+from sharding import ShardedScheduler
+
+class MigrationTest(unittest.TestCase):
+    def test_pids_still_remove_processes_after_migration(self):
+        with tempfile.TemporaryDirectory() as games_dir:
+            sharded = ShardedScheduler(shards=2, total_pages=64, games_dir=games_dir, simulated=True, seed=1)
+            try:
+                # All on shard 0, so rebalance() has to migrate half of them
+                pids = sharded._call(0, "add", [(f"Game{i}", 4, 2, None, "Player") for i in range(6)])
+                self.assertEqual(sharded.rebalance(), 3)
+                self.assertEqual([sharded.remove_process_by_pid(pid) for pid in pids], [True] * 6)
+                self.assertEqual(sharded.loads, [0, 0])
+            finally:
+                sharded.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+from collections import OrderedDict
+
+class TLB:
+    # Translation lookaside buffer caching (pid, virtual page) -> frame, LRU within each set.
+    # ways=None makes it fully associative. A tagged TLB keys entries by pid (like an ASID)
+    # and survives context switches; an untagged one is flushed whenever the pid changes.
+    # Each value is frame << 1 | dirty so a write through a clean entry takes the slow path
+    # once to set the page-table dirty bit, as a hardware TLB would.
+    def __init__(self, entries=16, ways=4, tagged=True):
+        ways = min(ways or entries, entries)
+        self.num_sets = max(1, entries // ways)
+        self.ways = ways
+        self.tagged = tagged
+        self.sets = [OrderedDict() for _ in range(self.num_sets)]
+        self.current_pid = None
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.invalidations = 0
+
+    def _set_for(self, pid, page):
+        return self.sets[(page + pid) % self.num_sets]
+
+    def switch_to(self, pid):
+        if pid != self.current_pid:
+            if not self.tagged and self.current_pid is not None:
+                self.flush()
+            self.current_pid = pid
+
+    def lookup(self, pid, page):
+        if pid != self.current_pid:
+            self.switch_to(pid)
+        entries = self.sets[(page + pid) % self.num_sets]
+        key = (pid, page)
+        value = entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def insert(self, pid, page, frame, dirty=False):
+        entries = self._set_for(pid, page)
+        key = (pid, page)
+        entries[key] = frame << 1 | dirty
+        entries.move_to_end(key)
+        if len(entries) > self.ways:
+            entries.popitem(last=False)
+
+    def invalidate(self, pid, page):
+        if self._set_for(pid, page).pop((pid, page), None) is not None:
+            self.invalidations += 1
+
+    def flush(self, pid=None):
+        if pid is None:
+            for entries in self.sets:
+                entries.clear()
+        else:
+            for entries in self.sets:
+                for key in [key for key in entries if key[0] == pid]:
+                    del entries[key]
+        self.flushes += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.num_sets * self.ways,
+            "ways": self.ways,
+            "tagged": self.tagged,
+            "hits": self.hits,
+            "misses": self.misses,
+            "flushes": self.flushes,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -2,20 +2,27 @@
 
 import time
 from datetime import datetime
-from colorama import Fore
+from log_pipeline import AsyncFileSink
+
+_event_sink = None  # Set by use_async_event_log(); None keeps the synchronous append
 
 def print_boxed_message(message):
     print("\n" + "+" + "-"*(len(message)+4) + "+")
     print(f"|  {message}  |")
     print("+" + "-"*(len(message)+4) + "+\n")
 
+# colorama is imported inside the functions that colour output, so headless callers of
+# log_event and friends never load it
+
 def sleep_with_countdown(seconds):
+    from colorama import Fore
     for i in range(seconds, 0, -1):
         print(f"{Fore.YELLOW}Starting in {i}...", end="\r")
         time.sleep(1)
     print(" " * 30, end="\r")  # Clear line after countdown
 
 def validate_int_input(prompt, min_val=None, max_val=None):
+    from colorama import Fore
     while True:
         try:
             value = int(input(prompt))
@@ -26,11 +33,20 @@ def validate_int_input(prompt, min_val=None, max_val=None):
         except ValueError:
             print(Fore.RED + "Invalid input. Please enter a valid integer.")
 
+def use_async_event_log(path="logs.txt"):
+    global _event_sink
+    if _event_sink is None:
+        _event_sink = AsyncFileSink(path)
+    return _event_sink
+
 def log_event(message):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     line = f"[{timestamp}] {message}"
-    with open("logs.txt", "a") as log_file:
-        log_file.write(line + "\n")
+    if _event_sink is not None:
+        _event_sink.write(line)
+    else:
+        with open("logs.txt", "a") as log_file:
+            log_file.write(line + "\n")
     return timestamp
 
 def print_progress_bar(current, total, prefix="", suffix="", length=30):
@@ -40,4 +56,5 @@ def print_progress_bar(current, total, prefix="", suffix="", length=30):
     print(f"{prefix} |{bar}| {percent}% {suffix}")
 
 def play_sound_effect(text="🎵 Sound played!"):
+    from colorama import Fore
     print(Fore.LIGHTBLUE_EX + f"[Sound Effect] {text}")